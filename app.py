@@ -1,6 +1,7 @@
 import streamlit as st
 from core import PAGE_CONFIG, load_css
-from data.loader import load_and_preprocess_data
+from data.loader import get_scheduler, load_and_preprocess_data
+from data.scheduler import render_refresh_status
 from page import FinancePage, AnalyticsPage
 
 # 1. Configuração de Página (Primeira chamada obrigatória)
@@ -11,10 +12,10 @@ load_css()
 
 
 def main():
-    # 3. Carregamento Único de Dados
-    df, _ = load_and_preprocess_data()
+    # 3. Carregamento Único de Dados (extrato + cubo mês x categoria)
+    ledger = load_and_preprocess_data()
 
-    if df.empty:
+    if ledger.empty:
         st.error(
             "❌ Não foi possível carregar a base de dados. Verifique o arquivo de origem."
         )
@@ -30,6 +31,8 @@ def main():
             index=0,
             help="Alterne entre o Dashboard Executivo e a Inteligência de Dados.",
         )
+        # Última atualização feita pelo agendador em background
+        render_refresh_status(get_scheduler().status())
         st.divider()
 
     # 5. Roteamento Dinâmico
@@ -39,7 +42,7 @@ def main():
     # Busca a classe no dicionário usando a opção selecionada
     try:
         page_class = pages[aba]
-        page_instance = page_class(df)
+        page_instance = page_class(ledger.df, ledger)
         page_instance.run()
     except KeyError:
         st.error(f"Erro de Roteamento: A página '{aba}' não foi encontrada.")
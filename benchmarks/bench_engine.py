@@ -0,0 +1,91 @@
+"""Benchmark: agregações do recorte por pandas (linhas e cubo) vs DuckDB.
+
+Para cada tamanho mede o que uma rerun pede ao dado: o resumo por categoria
+(KPIs e gráficos de barra) e a soma por dia (curva de saldo), com a seleção
+"Todos" e com uma seleção típica (12 meses, metade das categorias).
+
+- linhas: o caminho antigo, filtro das linhas + groupby no pandas
+- pandas: PandasEngine (resumo pelo cubo, soma diária pelas linhas)
+- duckdb: DuckDBEngine (filtro e agregação em SQL sobre o Arrow)
+
+Uso: python -m benchmarks.bench_engine [tamanhos, ex. 100000,1000000]
+"""
+
+import sys
+from functools import partial
+
+import pandas as pd
+
+from benchmarks.synthetic import gerar_valores
+from benchmarks.timing import melhor_de
+from data.cube import summarize_rows
+from data.dataset import build_ledger
+from data.engine import DuckDBEngine, PandasEngine
+from data.loader import process_data_logic
+from data.schema import codes_mask
+
+
+class _Linhas:
+    """O que as páginas faziam antes: tudo a partir das linhas filtradas."""
+
+    def __init__(self, df):
+        self.df = df
+
+    def _rows(self, meses, cats):
+        df = self.df
+        return df[
+            codes_mask(df["year_month"], meses) & codes_mask(df["CATEGORIA"], cats)
+        ]
+
+    def category_summary(self, meses, cats):
+        return summarize_rows(self._rows(meses, cats))
+
+    def daily_net(self, meses, cats):
+        rows = self._rows(meses, cats)
+        return rows.groupby("DATA")["VALOR_NUM"].sum().reset_index()
+
+
+def medir(n: int):
+    df, _ = process_data_logic(gerar_valores(n))
+    ledger = build_ledger(df)
+    meses = sorted(map(str, df["year_month"].cat.categories), reverse=True)
+    cats = sorted(map(str, df["CATEGORIA"].cat.categories))
+    selecoes = {
+        "todos": (meses, cats),
+        "12m/metade": (meses[:12], cats[: max(1, len(cats) // 2)]),
+    }
+
+    t_duck, duck = melhor_de(lambda: DuckDBEngine(ledger), repeat=1)
+    engines = {"linhas": _Linhas(df), "pandas": PandasEngine(ledger), "duckdb": duck}
+    print(f"\n{n} linhas (registro no DuckDB: {t_duck * 1000:.1f} ms)")
+    print(
+        f"{'seleção':<11} | {'engine':<7} | {'resumo (ms)':>11} | {'diário (ms)':>11}"
+    )
+
+    for nome_sel, (m, c) in selecoes.items():
+        ref = None
+        for nome, engine in engines.items():
+            t_res, res = melhor_de(partial(engine.category_summary, m, c))
+            t_dia, dia = melhor_de(partial(engine.daily_net, m, c))
+            print(
+                f"{nome_sel:<11} | {nome:<7} | {t_res * 1000:>11.2f} | "
+                f"{t_dia * 1000:>11.2f}"
+            )
+            if ref is None:
+                ref = (res, dia)
+                continue
+            # Mesmo resultado que o caminho das linhas (a ordem de soma difere)
+            pd.testing.assert_frame_equal(
+                res, ref[0], check_dtype=False, check_index_type=False, atol=1e-6
+            )
+            pd.testing.assert_frame_equal(dia, ref[1], check_dtype=False, atol=1e-6)
+
+
+def main():
+    tamanhos = sys.argv[1] if len(sys.argv) > 1 else "100000,1000000"
+    for n in map(int, tamanhos.split(",")):
+        medir(n)
+
+
+if __name__ == "__main__":
+    main()
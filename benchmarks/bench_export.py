@@ -0,0 +1,95 @@
+"""Benchmark: custo por rerun do export ansioso (CSV a cada rerun) vs sob demanda.
+
+As duas versões rodam como script Streamlit de verdade (AppTest), sem clique:
+- ansioso: o que a página fazia antes, to_csv().encode() + download_button;
+- sob demanda: render_export_panel, o painel do app (seletor de formato,
+  checagem do XLSX e download_button com callable).
+
+O tempo do painel é medido dentro do script; o da rerun inteira inclui o
+overhead do AppTest, igual para os dois.
+
+Uso: python -m benchmarks.bench_export [linhas]
+"""
+
+import sys
+from functools import partial
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import gerar_valores
+from benchmarks.timing import melhor_de
+from core.export import EXPORT_FORMATS, ExportCache
+from data.loader import process_data_logic
+
+RERUNS = 5
+
+
+def _app(n: int, modo: str):
+    """Script da página: o extrato vem do cache do processo, fora da medida."""
+    import time
+
+    import streamlit as st
+
+    from benchmarks.synthetic import gerar_valores
+    from core.export import render_export_panel
+    from data.loader import process_data_logic
+
+    @st.cache_resource
+    def extrato(n):
+        return process_data_logic(gerar_valores(n))[0]
+
+    df = extrato(n)
+    t0 = time.perf_counter()
+    if modo == "ansioso":
+        st.download_button(
+            "Baixar CSV",
+            data=df.to_csv(index=False).encode("utf-8-sig"),
+            file_name="extrato.csv",
+            mime="text/csv",
+        )
+    else:
+        render_export_panel(df, ("bench", n), "extrato", "bench", "Baixar")
+    st.session_state["t_painel"] = time.perf_counter() - t0
+
+
+def _reruns(n: int, modo: str):
+    """(ms/rerun do painel, ms/rerun do script) em RERUNS reruns sem clique."""
+    at = AppTest.from_function(_app, args=(n, modo), default_timeout=120)
+    at.run()  # Primeira rerun monta o extrato no cache_resource
+    painel = total = 0.0
+    for _ in range(RERUNS):
+        total += melhor_de(at.run, repeat=1)[0]
+        assert not at.exception, at.exception
+        painel += at.session_state["t_painel"]
+    return painel / RERUNS * 1000, total / RERUNS * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"{n} linhas, {RERUNS} reruns sem clique (ms/rerun)")
+    print(f"  {'':<12} {'painel':>9} {'rerun':>9}")
+    for modo in ("ansioso", "sob demanda"):
+        painel, total = _reruns(n, modo)
+        print(f"  {modo:<12} {painel:>9.2f} {total:>9.2f}")
+
+    df, _ = process_data_logic(gerar_valores(n))
+    cache = ExportCache()
+    key = ("bench", "todos")
+    print("\nno clique (1º = serializa, 2º = cache):")
+    for fmt, (ext, _, serialize) in EXPORT_FORMATS.items():
+        if ext == "xlsx" and n > 50_000:
+            continue  # XLSX é lento demais para entrar no benchmark padrão
+        build = partial(serialize, df)
+        get = partial(cache.get_or_build, (key, fmt), build)
+        primeiro, _ = melhor_de(get, repeat=1)
+        segundo, _ = melhor_de(get, repeat=1)
+        tamanho = len(cache.get_or_build((key, fmt), build)) / 1024**2
+        print(
+            f"  {fmt:<13} {primeiro * 1000:9.1f} ms -> {segundo * 1000:.3f} ms"
+            f"  ({tamanho:.1f} MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark: fetch formatado da aba inteira vs A:G sem formatação.
+
+Roda contra o FakeWorksheet (sem rede): mede células trafegadas e o tempo de
+process_data_logic sobre cada formato de resposta.
+
+Uso: python -m benchmarks.bench_fetch [linhas]
+"""
+
+import sys
+import time
+
+from benchmarks.fake_sheet import FakeWorksheet, gerar_celulas
+from data.loader import EXPECTED_COLS, FETCH_OPTS, process_data_logic
+from data.sync import fetch_values
+
+
+def _medir(ws, fetch):
+    ws.cells_served = 0
+    t0 = time.perf_counter()
+    values = fetch(ws)
+    t1 = time.perf_counter()
+    df, _ = process_data_logic(values)
+    t2 = time.perf_counter()
+    return ws.cells_served, t1 - t0, t2 - t1, df
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ws = FakeWorksheet(gerar_celulas(n))
+
+    antes = _medir(ws, lambda w: w.get_all_values())
+    # A mesma chamada do SheetsSource: só as colunas do extrato, valores crus
+    depois = _medir(ws, lambda w: fetch_values(w, len(EXPECTED_COLS), FETCH_OPTS))
+
+    print(f"{n} linhas\n")
+    print(f"{'':>22} | {'células':>9} | {'fake fetch (s)':>14} | {'processo (s)':>12}")
+    for nome, (cells, t_fetch, t_proc, _) in [
+        ("formatado, aba toda", antes),
+        ("cru, só o extrato", depois),
+    ]:
+        print(f"{nome:>22} | {cells:>9} | {t_fetch:>14.3f} | {t_proc:>12.3f}")
+
+    a, b = antes[3], depois[3]
+    iguais = a["DATA"].equals(b["DATA"]) and (
+        a[["VALOR_NUM", "Saldo Acumulado"]]
+        .round(2)
+        .equals(b[["VALOR_NUM", "Saldo Acumulado"]].round(2))
+    )
+    print(f"\nmesmo extrato nos dois formatos: {iguais}")
+    print(f"processo: {antes[2] / depois[2]:.1f}x mais rápido com valores crus")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Relatório de memória: bytes por linha do extrato antes/depois do esquema compacto.
+
+Uso: python -m benchmarks.bench_memory [linhas]
+"""
+
+import sys
+
+import pandas as pd
+
+from benchmarks.synthetic import gerar_valores
+from data.loader import process_data_logic
+from data.schema import CATEGORICAL_COLS, memory_report
+
+
+def esquema_antigo(df):
+    """Como o loader entregava antes: texto como object."""
+    old = df.copy()
+    for col in CATEGORICAL_COLS:
+        old[col] = old[col].astype(str).astype(object)
+    return old
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df, _ = process_data_logic(gerar_valores(n, formatado=True))
+    antes, depois = memory_report(esquema_antigo(df)), memory_report(df)
+
+    print(f"{n} linhas\n")
+    tabela = pd.concat(
+        [antes.reindex(depois.index), depois], axis=1, keys=["antes", "depois"]
+    )
+    print(tabela.to_string(na_rep="-"))
+    b_antes = antes["bytes_por_linha"].sum()
+    b_depois = depois["bytes_por_linha"].sum()
+    print(f"\nbytes/linha: {b_antes:.1f} -> {b_depois:.1f} ({b_depois / b_antes:.0%})")
+
+
+if __name__ == "__main__":
+    main()
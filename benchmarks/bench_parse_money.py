@@ -0,0 +1,28 @@
+"""Benchmark: parse_money linha a linha vs parse_money_series vetorizado.
+
+Uso: python -m benchmarks.bench_parse_money
+"""
+
+from functools import partial
+
+from benchmarks.synthetic import gerar_coluna_valor
+from benchmarks.timing import melhor_de
+from data.loader import parse_money, parse_money_series
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def main():
+    print(
+        f"{'linhas':>10} | {'apply (s)':>10} | {'vetorizado (s)':>14} | {'speedup':>7}"
+    )
+    for n in SIZES:
+        col = gerar_coluna_valor(n)
+        t_old, _ = melhor_de(partial(col.apply, parse_money), repeat=3)
+        t_new, _ = melhor_de(partial(parse_money_series, col), repeat=3)
+        assert col.apply(parse_money).equals(parse_money_series(col))
+        print(f"{n:>10} | {t_old:>10.3f} | {t_new:>14.3f} | {t_old / t_new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark: busca por termos com o índice invertido vs str.contains.
+
+Mede a construção do índice, a extensão com linhas novas (carga incremental)
+e consultas de um e de vários termos, contra a varredura de todas as linhas
+com str.contains no texto já sem acento. O contains acha substrings no meio
+das palavras; o índice, só prefixos de termo (nunca linhas a mais).
+
+Uso: python -m benchmarks.bench_search [linhas]
+"""
+
+import sys
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.synthetic import gerar_valores
+from benchmarks.timing import melhor_de
+from data.loader import process_data_logic
+from data.search import SEARCH_FIELDS, TokenIndex, _fold, tokenize
+
+CONSULTAS = ["nota", "lançamento 12", "NOTA fisc", "xyz"]
+NOVAS = 1_000
+
+
+def _varredura(texto: pd.Series, consulta: str) -> np.ndarray:
+    """Sem índice: str.contains de cada termo em todas as linhas."""
+    acha = np.ones(len(texto), dtype=bool)
+    for termo in tokenize(consulta):
+        acha &= texto.str.contains(termo, regex=False).to_numpy()
+    return acha
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df, _ = process_data_logic(gerar_valores(n))
+
+    t_build, index = melhor_de(lambda: TokenIndex.build(df), repeat=1)
+    base = TokenIndex.build(df.iloc[:-NOVAS])
+    t_ext, _ = melhor_de(lambda: base.extend(df))
+    print(f"{n} linhas, {len(index.segments[0].vocab)} termos distintos")
+    print(f"índice completo: {t_build:.3f}s | +{NOVAS} linhas: {t_ext * 1000:.1f} ms\n")
+
+    # Texto já sem acento e minúsculo: a varredura só paga o contains
+    texto = df[SEARCH_FIELDS[0]].astype("string").fillna("")
+    for col in SEARCH_FIELDS[1:]:
+        texto = texto + " " + df[col].astype("string").fillna("")
+    texto = pd.Series(_fold(pa.array(texto)), dtype="string")
+
+    print(
+        f"{'consulta':<16} | {'achadas':>7} | {'índice (ms)':>11} | "
+        f"{'contains (ms)':>13}"
+    )
+    for consulta in CONSULTAS:
+        t_ix, hits = melhor_de(partial(index.query, consulta))
+        t_scan, ref = melhor_de(partial(_varredura, texto, consulta))
+        # Prefixo de termo implica substring: o índice nunca acha a mais
+        assert not (hits & ~ref).any(), consulta
+        print(
+            f"{consulta!r:<16} | {int(hits.sum()):>7} | {t_ix * 1000:>11.2f} | "
+            f"{t_scan * 1000:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
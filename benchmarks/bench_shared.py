@@ -0,0 +1,43 @@
+"""Benchmark: ledger por st.cache_data (cópia por chamada) vs ledger compartilhado.
+
+O st.cache_data guarda o retorno serializado (pickle) e devolve a cada
+chamada uma cópia desserializada: toda rerun paga o unpickle e cada sessão em
+meio a uma rerun segura um extrato inteiro só seu. O ledger compartilhado é
+o mesmo objeto para todos; a rerun só cria o invólucro raso de `ledger.df`.
+
+Uso: python -m benchmarks.bench_shared [linhas] [sessoes]
+"""
+
+import pickle
+import sys
+
+from benchmarks.synthetic import gerar_valores
+from benchmarks.timing import melhor_de
+from data.dataset import build_ledger
+from data.loader import process_data_logic
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    sessoes = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    df, _ = process_data_logic(gerar_valores(n))
+    ledger = build_ledger(df)
+    mb = ledger.nbytes / 2**20
+
+    blob = pickle.dumps(ledger, protocol=pickle.HIGHEST_PROTOCOL)
+    t_copia, _ = melhor_de(lambda: pickle.loads(blob))
+    t_view, _ = melhor_de(lambda: ledger.df, repeat=50)
+
+    print(f"{n} linhas, ledger com {mb:.1f} MB (pickle: {len(blob) / 2**20:.1f} MB)\n")
+    print(f"{'por rerun':<22} | {'ms':>8}")
+    print(f"{'cache_data (unpickle)':<22} | {t_copia * 1000:>8.1f}")
+    print(f"{'compartilhado (df)':<22} | {t_view * 1000:>8.3f}")
+
+    # Pior caso: todas as sessões no meio de uma rerun ao mesmo tempo
+    print(
+        f"\n{sessoes} sessões simultâneas: cópias {sessoes * mb:.0f} MB -> {mb:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
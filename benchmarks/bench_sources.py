@@ -0,0 +1,85 @@
+"""Benchmark: a mesma carga por cada origem de dados, sem rede.
+
+Grava um extrato sintético em CSV (texto formatado, como exportado da
+planilha), Parquet e SQLite (valores tipados) e mede source.load() em cada
+um, ao lado do Sheets com o FakeWorksheet. Todas devem dar o mesmo extrato.
+
+Uso: python -m benchmarks.bench_sources [linhas]
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.fake_sheet import FakeWorksheet, gerar_celulas
+from benchmarks.synthetic import DIAS, INICIO
+from benchmarks.timing import melhor_de
+from data.loader import EXPECTED_COLS, FETCH_OPTS, process_data_logic, process_frame
+from data.sources import CSVSource, ParquetSource, SheetsSource, SQLiteSource
+from data.workbook import Workbook
+
+
+def _frame(ws, **opts) -> pd.DataFrame:
+    values = ws.get_values("A:G", **opts)
+    return pd.DataFrame(values[2:], columns=values[1])
+
+
+def _mesmo(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    try:
+        pd.testing.assert_frame_equal(
+            a, b, check_dtype=False, check_categorical=False, atol=0.005
+        )
+        return True
+    except AssertionError:
+        return False
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    ws = FakeWorksheet(gerar_celulas(n, inicio=INICIO, dias=DIAS))
+    tipado = _frame(ws, **FETCH_OPTS)
+    tipado["DATA"] = pd.Timestamp("1899-12-30") + pd.to_timedelta(
+        tipado["DATA"], unit="D"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _frame(ws).to_csv(tmp / "extrato.csv", index=False)
+        tipado.to_parquet(tmp / "extrato.parquet", index=False)
+        with sqlite3.connect(tmp / "extrato.db") as con:
+            tipado.to_sql("lancamentos", con, index=False)
+
+        # Sem incremental: mede a carga completa da aba a cada repetição
+        workbook = Workbook(
+            process_data_logic, n_cols=7, fetch_opts=FETCH_OPTS, incremental=False
+        )
+        origens = {
+            "sheets (fake, A:G cru)": SheetsSource(lambda: None, workbook, [0]),
+            "csv (texto formatado)": CSVSource(tmp / "extrato.csv", process_frame),
+            "parquet (memory map)": ParquetSource(
+                tmp / "extrato.parquet", process_frame, columns=EXPECTED_COLS
+            ),
+            "sqlite": SQLiteSource(tmp / "extrato.db", process_frame),
+        }
+        # Sem cliente de verdade: a aba é o worksheet falso
+        origens["sheets (fake, A:G cru)"]._worksheets[0] = ws
+
+        print(f"{n} linhas\n")
+        print(f"{'origem':<24} | {'load (s)':>8} | linhas")
+        resultados = {}
+        for nome, source in origens.items():
+            t, (df, _) = melhor_de(source.load)
+            resultados[nome] = df
+            print(f"{nome:<24} | {t:>8.3f} | {len(df)}")
+
+    ref = resultados["sheets (fake, A:G cru)"]
+    cols = ["DATA", "CATEGORIA", "VALOR_NUM", "Saldo Acumulado"]
+    iguais = all(_mesmo(df[cols], ref[cols]) for df in resultados.values())
+    print(f"\nmesmo extrato em todas as origens: {iguais}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark: tempo de import na partida do app (o que app.py importa).
+
+Cada medida roda num processo Python novo (cache de módulos vazio). Compara
+os imports do app como estão (plotly e gspread preguiçosos) com os mesmos
+imports forçando as dependências pesadas, que é o custo de antes.
+
+Uso: python -m benchmarks.bench_startup [repetições]
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+APP = "import core, data.loader, page"
+PESADOS = ["plotly.express", "plotly.graph_objects", "gspread", "oauth2client"]
+
+CENARIOS = {
+    "streamlit + pandas (piso)": "import streamlit, pandas",
+    "app, imports preguiçosos": APP,
+    "app, imports ansiosos (antes)": APP
+    + "; import "
+    + ", ".join(PESADOS[:-1])
+    + ", oauth2client.service_account",
+}
+
+_SCRIPT = """
+import sys, time
+t0 = time.perf_counter()
+{code}
+dt = time.perf_counter() - t0
+carregados = [m for m in {pesados!r} if m in sys.modules]
+print(dt, ",".join(carregados))
+"""
+
+
+def _medir(code: str):
+    script = _SCRIPT.format(code=code, pesados=PESADOS)
+    out = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(out[0]), out[1] if len(out) > 1 else ""
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"mediana de {repeticoes} processos novos\n")
+    print(f"{'cenário':<32} | {'import (s)':>10} | pesados carregados")
+    tempos = {}
+    for nome, code in CENARIOS.items():
+        medidas = [_medir(code) for _ in range(repeticoes)]
+        tempos[nome] = statistics.median(t for t, _ in medidas)
+        print(f"{nome:<32} | {tempos[nome]:>10.3f} | {medidas[-1][1] or '-'}")
+
+    antes = tempos["app, imports ansiosos (antes)"]
+    depois = tempos["app, imports preguiçosos"]
+    print(f"\nganho na partida: {antes - depois:.3f}s ({1 - depois / antes:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark: carga de várias abas (uma por ano) em série vs em paralelo.
+
+Cada aba do FakeSpreadsheet dorme `latency` segundos por fetch, imitando a
+API. Em paralelo o tempo total fica perto de uma latência, não da soma; na
+segunda carga os anos fechados não voltam à API.
+
+Uso: python -m benchmarks.bench_workbook [abas] [latência_s]
+"""
+
+import sys
+import time
+
+from benchmarks.fake_sheet import FakeSpreadsheet
+from data.loader import EXPECTED_COLS, FETCH_OPTS, process_data_logic
+from data.workbook import Workbook
+
+LINHAS_POR_ABA = 20_000
+
+
+def _carga(n_abas: int, latency: float, workers: int):
+    anos = list(range(2026 - n_abas, 2026))
+    sh = FakeSpreadsheet.por_ano(anos, LINHAS_POR_ABA, latency)
+    wb = Workbook(
+        process_data_logic,
+        n_cols=len(EXPECTED_COLS),
+        fetch_opts=FETCH_OPTS,
+        incremental=False,
+        max_workers=workers,
+    )
+    refs = [str(a) for a in anos]
+    t0 = time.perf_counter()
+    df, _ = wb.refresh(refs, sh.worksheet)
+    t1 = time.perf_counter()
+    chamadas = sh.calls
+    wb.refresh(refs, sh.worksheet)
+    t2 = time.perf_counter()
+    return df, t1 - t0, t2 - t1, chamadas, sh.calls - chamadas
+
+
+def main():
+    n_abas = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+
+    print(f"{n_abas} abas x {LINHAS_POR_ABA} linhas, {latency}s de latência/fetch\n")
+    print(f"{'workers':>8} | {'1ª carga (s)':>12} | {'2ª carga (s)':>12} | fetches")
+    resultados = {}
+    for workers in (1, n_abas):
+        df, t1, t2, c1, c2 = _carga(n_abas, latency, workers)
+        resultados[workers] = df
+        print(f"{workers:>8} | {t1:>12.2f} | {t2:>12.2f} | {c1} + {c2}")
+
+    a, b = resultados[1], resultados[n_abas]
+    saldo_ok = abs(b["Saldo Acumulado"].iloc[-1] - b["VALOR_NUM"].sum()) < 1e-6
+    print(f"\nmesmo resultado em série e em paralelo: {a.equals(b)}")
+    print(f"saldo global consistente: {saldo_ok}")
+    print(
+        f"meses: {b['year_month'].cat.categories[0]} .. "
+        f"{b['year_month'].cat.categories[-1]}"
+    )
+
+
+if __name__ == "__main__":
+    main()
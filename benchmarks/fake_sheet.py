@@ -0,0 +1,153 @@
+"""Worksheet falso para rodar o loader sem rede.
+
+Guarda as células tipadas (data, número, texto) e as entrega como o gspread
+faria: formatadas em texto por padrão ou cruas com UNFORMATTED_VALUE /
+SERIAL_NUMBER. Conta as células servidas para comparar o volume dos fetches.
+"""
+
+import datetime
+import random
+import re
+import time
+
+from data.loader import EXPECTED_COLS
+
+CATEGORIAS = ["Eventos", "Patrocínio", "Loja", "Manutenção", "Festa", "Transporte"]
+# Colunas auxiliares à direita do extrato (fórmulas, conferência, etc.)
+EXTRAS = ["MÊS", "CONFERIDO", "RESPONSÁVEL", "NF", "LINK"]
+_EPOCH = datetime.date(1899, 12, 30)
+_RANGE = re.compile(r"([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?$")
+
+
+def gerar_celulas(
+    n: int,
+    seed: int = 0,
+    extras: bool = True,
+    inicio: datetime.date = datetime.date(2020, 1, 1),
+    dias: int = 2000,
+):
+    """Título + cabeçalho + n lançamentos tipados (date/float/str).
+
+    As datas cobrem `dias` dias a partir de `inicio`, em ordem.
+    """
+    r = random.Random(seed)
+    header = list(EXPECTED_COLS) + (EXTRAS if extras else [])
+    linhas = [["CAEC - Extrato"], header]
+    saldo = 0.0
+    for i in range(n):
+        tipo = "Despesa" if r.random() < 0.6 else "Receita"
+        valor = round(r.uniform(5, 5000), 2)
+        saldo += valor if tipo == "Receita" else -valor
+        data = inicio + datetime.timedelta(days=i * dias // max(n, 1))
+        linha = [
+            data,
+            tipo,
+            r.choice(CATEGORIAS),
+            f"Lançamento {i}",
+            valor,
+            "" if i % 5 else "nota fiscal",
+            round(saldo, 2),
+        ]
+        if extras:
+            linha += [data.strftime("%m/%Y"), "ok", "adm", f"NF-{i}", ""]
+        linhas.append(linha)
+    return linhas
+
+
+def _formatado(v):
+    if isinstance(v, datetime.date):
+        return v.strftime("%d/%m/%Y")
+    if isinstance(v, float):
+        txt = f"{abs(v):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return f"R$ {txt}" if v >= 0 else f"-R$ {txt}"
+    return str(v)
+
+
+def _cru(v, serial: bool):
+    if isinstance(v, datetime.date):
+        return (v - _EPOCH).days if serial else v.strftime("%d/%m/%Y")
+    return v
+
+
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+class FakeWorksheet:
+    """Subconjunto de gspread.Worksheet usado pelo loader e pela sync."""
+
+    def __init__(self, linhas, latency: float = 0.0):
+        self.linhas = linhas
+        self.latency = latency
+        self.calls = 0
+        self.cells_served = 0
+
+    def append_rows(self, rows):
+        self.linhas.extend(rows)
+
+    def get_values(
+        self,
+        range_name=None,
+        value_render_option=None,
+        date_time_render_option=None,
+        **_,
+    ):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        r0, r1, c0, c1 = 1, len(self.linhas), 1, None
+        if range_name:
+            m = _RANGE.match(range_name)
+            c0 = _col_index(m.group(1))
+            r0 = int(m.group(2) or 1)
+            c1 = _col_index(m.group(3)) if m.group(3) else c0
+            r1 = int(m.group(4)) if m.group(4) else len(self.linhas)
+
+        # As opções do gspread são StrEnum: comparam igual à string da API
+        cru = value_render_option == "UNFORMATTED_VALUE"
+        serial = date_time_render_option == "SERIAL_NUMBER"
+        width = max(len(linha) for linha in self.linhas) if c1 is None else c1
+
+        out = []
+        for linha in self.linhas[r0 - 1 : r1]:
+            cells = linha[c0 - 1 : width]
+            cells = [_cru(v, serial) if cru else _formatado(v) for v in cells]
+            out.append(cells + [""] * (width - c0 + 1 - len(cells)))
+        self.cells_served += sum(len(r) for r in out)
+        return out
+
+    get = get_values
+
+    def get_all_values(self, **opts):
+        return self.get_values(None, **opts)
+
+
+class FakeSpreadsheet:
+    """Planilha falsa com uma aba por ano (títulos "2021", "2022", ...)."""
+
+    def __init__(self, abas: dict, latency: float = 0.0):
+        self.abas = {t: FakeWorksheet(linhas, latency) for t, linhas in abas.items()}
+
+    @classmethod
+    def por_ano(cls, anos, n_por_ano: int, latency: float = 0.0):
+        abas = {
+            str(ano): gerar_celulas(
+                n_por_ano, seed=ano, inicio=datetime.date(ano, 1, 1), dias=365
+            )
+            for ano in anos
+        }
+        return cls(abas, latency)
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        return self.abas[title]
+
+    def get_worksheet(self, index: int) -> FakeWorksheet:
+        return list(self.abas.values())[index]
+
+    @property
+    def calls(self) -> int:
+        return sum(ws.calls for ws in self.abas.values())
@@ -0,0 +1,174 @@
+"""Suíte de benchmarks dos caminhos quentes, sem o servidor do Streamlit.
+
+Para cada tamanho de extrato sintético mede, separadamente: process_data_logic,
+build_ledger (cubo + versão), o filtro da sidebar (por mês e por período), os
+KPIs e cada FinanceVisualizer.plot_* (construção da figura, serialização e
+bytes do JSON que iria ao navegador). Grava uma linha JSON por medida, para comparar rodadas.
+
+Uso:
+    python -m benchmarks.suite [--sizes 1000,10000,100000,1000000]
+                               [--out arquivo.jsonl] [--compare anterior.jsonl]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synthetic import gerar_valores
+from benchmarks.timing import melhor_de
+from core.filters import FilterEngine, filter_by_selection
+from core.kpis import kpi_totals
+from core.plots import FinanceVisualizer
+from data.cube import slice_cube, summarize_categories
+from data.dataset import build_ledger
+from data.loader import process_data_logic
+from data.period import PRESETS, filter_by_period
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = Path(__file__).parent / "results"
+# (nome do gráfico, kwargs): um por FinanceVisualizer.plot_*
+PLOTS = [
+    ("plot_analise_pareto", {}),
+    ("plot_volume_dados", {}),
+    ("plot_ticket_medio", {}),
+    ("plot_saldo_por_categoria", {}),
+    ("plot_ranking", {"tipo": "despesa"}),
+    ("plot_ranking", {"tipo": "receita"}),
+    ("plot_dispersao", {}),
+    ("plot_run_chart", {}),
+]
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "?"
+
+
+def _selecao(df):
+    """Seleção típica da sidebar: últimos 12 meses e metade das categorias."""
+    meses = sorted(map(str, df["year_month"].unique()), reverse=True)[:12]
+    cats = sorted(map(str, df["CATEGORIA"].unique()))
+    return meses, cats[: max(1, len(cats) // 2)]
+
+
+def medir(n: int, seed: int = 0):
+    """Gera (etapa, segundos, bytes) para um extrato de n linhas."""
+    repeat = 3 if n <= 100_000 else 1
+    values = gerar_valores(n, seed=seed)
+
+    t, (df, _) = melhor_de(lambda: process_data_logic(values), repeat)
+    yield "process_data_logic", t, None
+    t, ledger = melhor_de(lambda: build_ledger(df), repeat)
+    yield "build_ledger", t, None
+
+    meses, cats = _selecao(df)
+    t, df_f = melhor_de(lambda: filter_by_selection(df, meses, cats), repeat)
+    yield "filtro/linhas", t, None
+    engine = FilterEngine()
+    engine.filter(df, ledger.version, meses, cats)
+    t, _ = melhor_de(lambda: engine.filter(df, ledger.version, meses, cats), repeat)
+    yield "filtro/cache_hit", t, None
+    # Últimos 30 dias: busca binária em DATA + máscara só na janela
+    periodo = PRESETS["Últimos 30 dias"](df["DATA"].iloc[-1].date())
+    t, _ = melhor_de(lambda: filter_by_period(df, periodo, cats), repeat)
+    yield "filtro/periodo_30d", t, None
+
+    t, cube_f = melhor_de(lambda: slice_cube(ledger.cube, meses, cats), repeat)
+    yield "cubo/recorte", t, None
+    t, _ = melhor_de(lambda: kpi_totals(df_f), repeat)
+    yield "kpis/linhas", t, None
+    t, _ = melhor_de(lambda: kpi_totals(df_f, cube_f), repeat)
+    yield "kpis/cubo", t, None
+    # Deltas dos KPIs: período anterior equivalente pelo índice de saldos
+    t, _ = melhor_de(lambda: ledger.balances.previous(meses, cats), repeat)
+    yield "kpis/periodo_anterior", t, None
+    t, _ = melhor_de(lambda: ledger.balances.year_ago(meses, cats), repeat)
+    yield "kpis/ano_anterior", t, None
+    t, _ = melhor_de(lambda: ledger.balances.rolling_mean(cats, 3), repeat)
+    yield "kpis/media_movel", t, None
+
+    summary = summarize_categories(cube_f)
+    for nome, kwargs in PLOTS:
+        etapa = nome + "".join(f"[{v}]" for v in kwargs.values())
+        viz = FinanceVisualizer(df_f, summary=summary)
+        t, fig = melhor_de(partial(getattr(viz, nome), **kwargs), repeat)
+        yield f"plot/{etapa}", t, None
+        t, payload = melhor_de(fig.to_json, repeat)
+        yield f"json/{etapa}", t, len(payload.encode("utf-8"))
+
+
+def rodar(sizes, out: Path, seed: int = 0):
+    run = time.strftime("%Y%m%d-%H%M%S")
+    meta = {
+        "run": run,
+        "rev": _git_rev(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+    }
+    out.parent.mkdir(parents=True, exist_ok=True)
+    registros = []
+    with out.open("a", encoding="utf-8") as f:
+        for n in sizes:
+            print(f"\n{n} linhas")
+            for etapa, segundos, nbytes in medir(n, seed):
+                reg = {**meta, "n": n, "etapa": etapa, "segundos": segundos}
+                if nbytes is not None:
+                    reg["bytes"] = nbytes
+                f.write(json.dumps(reg) + "\n")
+                registros.append(reg)
+                extra = f"  {nbytes / 1024:10.1f} KiB" if nbytes is not None else ""
+                print(f"  {etapa:<38} {segundos * 1000:10.2f} ms{extra}")
+    print(f"\nresultados em {out}")
+    return registros
+
+
+def comparar(anterior: Path, registros):
+    """Tabela anterior x atual (última rodada de cada arquivo, por etapa)."""
+    antigos = {}
+    for linha in anterior.read_text(encoding="utf-8").splitlines():
+        reg = json.loads(linha)
+        antigos[(reg["n"], reg["etapa"])] = reg["segundos"]
+
+    print(f"\ncomparação com {anterior}")
+    print(f"  {'n':>9} {'etapa':<38} {'antes ms':>10} {'agora ms':>10} {'razão':>7}")
+    for reg in registros:
+        antes = antigos.get((reg["n"], reg["etapa"]))
+        if antes is None:
+            continue
+        razao = reg["segundos"] / antes if antes else float("nan")
+        print(
+            f"  {reg['n']:>9} {reg['etapa']:<38} {antes * 1000:>10.2f} "
+            f"{reg['segundos'] * 1000:>10.2f} {razao:>6.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--compare", type=Path)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    out = args.out or RESULTS_DIR / f"suite-{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+    registros = rodar(sizes, out, args.seed)
+    if args.compare:
+        comparar(args.compare, registros)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Geradores determinísticos de dados sintéticos para os benchmarks.
+
+A mesma (n, seed) sempre gera os mesmos dados. `gerar_valores` é o extrato
+no layout da planilha: a lista de listas que process_data_logic recebe da
+API, no formato atual do fetch (só o extrato, valores crus) ou no formatado
+antigo (get_all_values em texto). `gerar_coluna_valor` é só a coluna VALOR
+em texto, com todos os formatos que o parser precisa aceitar.
+"""
+
+import datetime
+import random
+
+import pandas as pd
+
+from benchmarks.fake_sheet import FakeWorksheet, gerar_celulas
+from data.loader import EXPECTED_COLS, FETCH_OPTS
+from data.sync import fetch_values
+
+# Seis anos de lançamentos, qualquer que seja o número de linhas
+INICIO = datetime.date(2020, 1, 1)
+DIAS = 6 * 365
+
+
+def gerar_valores(n: int, seed: int = 0, formatado: bool = False):
+    """Título + cabeçalho + n lançamentos, como a API devolveria."""
+    ws = FakeWorksheet(gerar_celulas(n, seed=seed, inicio=INICIO, dias=DIAS))
+    if formatado:
+        return [linha[:7] for linha in ws.get_all_values()]
+    return fetch_values(ws, len(EXPECTED_COLS), FETCH_OPTS)
+
+
+def gerar_coluna_valor(n: int, seed: int = 42) -> pd.Series:
+    """Coluna VALOR em texto (R$, milhar, vírgula, negativos, vazios e lixo)."""
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        r = rnd.random()
+        v = rnd.uniform(0, 50_000)
+        txt = f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        if r < 0.70:
+            out.append(f"R$ {txt}")
+        elif r < 0.85:
+            out.append(txt)
+        elif r < 0.93:
+            out.append(f"(R$ {txt})")
+        elif r < 0.97:
+            out.append("")
+        else:
+            out.append("a confirmar")
+    return pd.Series(out, dtype=object)
@@ -0,0 +1,19 @@
+"""Medição comum a todos os benchmarks."""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+def melhor_de(fn: Callable, repeat: int = 5) -> tuple[float, Any]:
+    """(melhor tempo de `repeat` execuções em segundos, resultado da última).
+
+    O melhor tempo descarta ruído do sistema; a primeira execução também
+    aquece o que for preguiçoso (regex compilada, imports, caches do pandas).
+    """
+    melhor, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor, out
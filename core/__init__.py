@@ -1,15 +1,34 @@
+import importlib
+
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 
 from .base_page import BasePage
 from .config import INSTITUTIONAL, PAGE_CONFIG
 from .style import load_css
 from .filters import apply_sidebar_filters
 from .kpis import render_kpis
+from .export import render_export_panel
+
+# Plotly e a classe que centraliza todos os gráficos são carregados só no
+# primeiro uso (core.px, core.go, core.FinanceVisualizer): páginas e reruns
+# que não desenham gráfico não pagam esse import na partida.
+_LAZY = {
+    "px": ("plotly.express", None),
+    "go": ("plotly.graph_objects", None),
+    "FinanceVisualizer": (".plots", "FinanceVisualizer"),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attr = _LAZY[name]
+    value = importlib.import_module(module, __name__)
+    if attr is not None:
+        value = getattr(value, attr)
+    globals()[name] = value  # Próximos acessos não passam mais por aqui
+    return value
 
-# Importamos a classe que centraliza todos os gráficos
-from .plots import FinanceVisualizer
 
 __all__ = [
     "st",
@@ -22,4 +41,5 @@ __all__ = [
     "FinanceVisualizer",  # Classe centralizadora
     "apply_sidebar_filters",
     "render_kpis",
+    "render_export_panel",
 ]
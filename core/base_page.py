@@ -1,27 +1,233 @@
 from abc import ABC, abstractmethod
+from functools import partial
+import numpy as np
+import pandas as pd
 import streamlit as st
-from .filters import apply_sidebar_filters
+from data.cube import summarize_rows
+from data.dataset import dataset_fingerprint
+from data.engine import get_engine
+from data.period import period_balances, previous_period
+from .config import ROLLING_MONTHS
+from .figure_cache import get_figure_cache
+from .filters import apply_sidebar_filters, get_filter_engine, render_filter_controls
 from .kpis import render_kpis  # Certifique-se de que o path está correto
+from .sessions import get_session_registry, track_session
+from .timing import StageTimer, maybe_profile, record_metrics
 
 
 class BasePage(ABC):
     """Motor central do BI: Título, KPIs e Footer automáticos."""
 
-    def __init__(self, df):
+    def __init__(self, df, ledger=None):
         self.df = df
+        self.ledger = ledger
         self._df_filtered = None
+        self.meses_sel = None
+        self.cats_sel = None
+        # (inicio, fim) no filtro por período; None no filtro por mês
+        self.periodo_sel = None
+        # Texto da busca por termos ("" sem busca)
+        self.busca_sel = ""
+        self._version = ledger.version if ledger is not None else None
+        self._viz = None
+        self._summary = None
+        # Tempo de cada etapa da rerun (painel de debug e arquivo de métricas)
+        self.timer = StageTimer()
+
+    @property
+    def version(self):
+        """Versão do dataset (chave dos caches); calculada se veio só o df."""
+        if not self._version:
+            self._version = dataset_fingerprint(self.df)
+        return self._version
 
     @property
     def df_f(self):
         """Property de leitura: evita o erro de 'setter' que você teve."""
         if self._df_filtered is None:
-            self._df_filtered = apply_sidebar_filters(self.df)
+            self._df_filtered = apply_sidebar_filters(self.df, self.version)
         return self._df_filtered
 
+    @property
+    def row_level(self):
+        """Recorte que não sai do cubo (período livre ou busca): agrega linhas."""
+        return self.periodo_sel is not None or bool(self.busca_sel)
+
+    @property
+    def balances(self):
+        """(saldo inicial, saldo final) do recorte, pelo índice de prefixos."""
+        if self.ledger is None or self.ledger.balances is None:
+            return None
+        # Saldo só dos lançamentos achados na busca não é saldo de caixa
+        if self.meses_sel is None or self.busca_sel:
+            return None
+        if self.periodo_sel is not None:
+            return period_balances(self.ledger, self.periodo_sel, self.cats_sel)
+        idx = self.ledger.balances
+        return (
+            idx.opening(self.meses_sel, self.cats_sel),
+            idx.closing(self.meses_sel, self.cats_sel),
+        )
+
+    @property
+    def previous(self):
+        """(receitas, despesas, rótulo) do período anterior equivalente, ou None.
+
+        No filtro por mês a seleção é deslocada pela própria extensão (séries
+        mensais do índice de saldos); no período livre, os mesmos tantos dias antes.
+        Busca não tem período anterior.
+        """
+        if self.ledger is None or self.meses_sel is None or self.busca_sel:
+            return None
+        if self.periodo_sel is not None:
+            prev = previous_period(self.ledger, self.periodo_sel, self.cats_sel)
+            unidade = ("dia anterior", "dias anteriores")
+        elif self.ledger.balances is not None:
+            prev = self.ledger.balances.previous(self.meses_sel, self.cats_sel)
+            unidade = ("mês anterior", "meses anteriores")
+        else:
+            return None
+        if prev is None:
+            return None
+        receitas, despesas, n = prev
+        rotulo = f"vs {unidade[0]}" if n == 1 else f"vs {n} {unidade[1]}"
+        return receitas, despesas, rotulo
+
+    def _by_month(self) -> bool:
+        """Recorte de meses inteiros com índice de saldos (sem período, sem busca)."""
+        return (
+            self.ledger is not None
+            and self.ledger.balances is not None
+            and self.meses_sel is not None
+            and not self.row_level
+        )
+
+    @property
+    def year_ago(self):
+        """(receitas, despesas) dos mesmos meses no ano anterior, ou None.
+
+        Só no filtro por mês: 12 linhas acima no calendário do índice de saldos.
+        """
+        if not self._by_month():
+            return None
+        return self.ledger.balances.year_ago(self.meses_sel, self.cats_sel)
+
+    @property
+    def rolling(self):
+        """(meses, saldo líquido médio) da janela móvel até o último mês, ou None."""
+        if not self._by_month():
+            return None
+        idx = self.ledger.balances
+        rows = idx.months.get_indexer(list(self.meses_sel))
+        if not (rows >= 0).any():
+            return None
+        media = idx.rolling_mean(self.cats_sel, ROLLING_MONTHS)[rows.max()]
+        return None if np.isnan(media) else (ROLLING_MONTHS, float(media))
+
+    @property
+    def engine(self):
+        """Engine de consulta da versão atual (None sem ledger ou sem seleção)."""
+        if self.ledger is None or self.ledger.cube is None or self.meses_sel is None:
+            return None
+        return get_engine(self.ledger)
+
+    @property
+    def category_summary(self):
+        """Resumo por categoria vindo da engine (cubo ou SQL), um por rerun.
+
+        No filtro por período ou com busca o resumo sai das k linhas do recorte.
+        """
+        if self._summary is None and self.row_level:
+            self._summary = summarize_rows(self.df_f)
+        if self._summary is None and self.engine is not None:
+            self._summary = self.engine.category_summary(self.meses_sel, self.cats_sel)
+        return self._summary
+
+    @property
+    def viz(self):
+        """FinanceVisualizer do recorte, criado só se faltar gráfico no cache."""
+        if self._viz is None:
+            from .plots import FinanceVisualizer  # plotly só no primeiro gráfico
+
+            engine, daily_fn = self.engine, None
+            if engine is not None and engine.pushdown and not self.row_level:
+                # Curva de saldo agregada na engine; senão, das linhas do recorte
+                daily_fn = partial(engine.daily_net, self.meses_sel, self.cats_sel)
+            balances = self.balances
+            self._viz = FinanceVisualizer(
+                self.df_f,
+                summary=self.category_summary,
+                daily_fn=daily_fn,
+                opening=balances[0] if balances is not None else 0.0,
+            )
+        return self._viz
+
+    @property
+    def selection_key(self):
+        """(versão, meses, categorias, período, busca): chave dos caches."""
+        if self.meses_sel is None:
+            return None
+        return (
+            self.version,
+            frozenset(self.meses_sel),
+            frozenset(self.cats_sel),
+            self.periodo_sel,
+            self.busca_sel,
+        )
+
+    def figure(self, name: str, **params):
+        """Figura `viz.<name>(**params)`, servida do cache quando possível."""
+
+        def build():
+            # Só cronometra quando o gráfico é de fato construído (cache miss)
+            with self.timer.stage(f"plot/{name}"):
+                return getattr(self.viz, name)(**params)
+
+        if self.selection_key is None:
+            return build()
+        key = (*self.selection_key, name, tuple(sorted(params.items())))
+        return get_figure_cache().get_or_build(key, build)
+
+    def render_sections(self, sections: dict, key: str):
+        """Abas preguiçosas: só a aba aberta executa e envia seus gráficos.
+
+        `sections` mapeia rótulo -> callable. Com on_change="rerun" o st.tabs
+        rastreia a aba ativa; trocar de aba gera uma rerun que renderiza a nova.
+        """
+        tabs = st.tabs(list(sections), key=key, on_change="rerun")
+        for tab, (label, render) in zip(tabs, sections.items()):
+            # open é None quando o Streamlit não rastreia estado: renderiza tudo
+            if tab.open is False:
+                continue
+            with tab, self.timer.stage(f"aba/{label}"):
+                render()
+
     def run(self):
-        """Fluxo de execução padronizado."""
+        """Fluxo de execução padronizado, cronometrado por etapa.
+
+        Com ?profile=1 na URL a rerun inteira roda sob cProfile e as etapas
+        vão para o arquivo de métricas.
+        """
+        profiling = st.query_params.get("profile") == "1"
+        with maybe_profile(profiling) as profile, self.timer.stage("run"):
+            self._run_stages()
+
+        session_bytes = track_session(self.ledger)
+        record_metrics(
+            self.timer,
+            profiling,
+            page=type(self).__name__,
+            version=self.version,
+            rows=len(self.df_f),
+            session_bytes=session_bytes,
+        )
+        # 6. Painel de diagnóstico (só com ?debug=1 na URL)
+        self._render_debug_panel(profile.get("text"))
+
+    def _run_stages(self):
         # 1. Sidebar (Filtros)
-        self.render_sidebar()
+        with self.timer.stage("sidebar"):
+            self.render_sidebar()
 
         # 2. Validação de dados
         if self.df_f.empty:
@@ -29,22 +235,46 @@ class BasePage(ABC):
             return
 
         # 3. Cabeçalho Padrão (Título + KPIs)
-        self._render_base_header()
+        with self.timer.stage("header"):
+            self._render_base_header()
 
         # 4. Conteúdo Específico da Página
-        self.render_body()
+        with self.timer.stage("body"):
+            self.render_body()
 
         # 5. Footer fixo da diretoria
         self._render_base_footer()
 
     def render_sidebar(self):
         """Aplica os filtros globais."""
-        self._df_filtered = apply_sidebar_filters(self.df)
+        (
+            self.meses_sel,
+            self.cats_sel,
+            self.periodo_sel,
+            self.busca_sel,
+        ) = render_filter_controls(self.df, self.version)
+        self._df_filtered = get_filter_engine().filter(
+            self.df,
+            self.version,
+            self.meses_sel,
+            self.cats_sel,
+            self.periodo_sel,
+            busca=self.busca_sel,
+            index=self.ledger.search if self.ledger is not None else None,
+        )
 
     def _render_base_header(self):
         """Renderiza o topo comum a todas as páginas."""
         st.title("DashBoard Financeiro Caec")
-        render_kpis(self.df_f)
+        # O resumo por categoria tem pos_sum/neg_sum: os KPIs somam dele
+        render_kpis(
+            self.df_f,
+            summary=self.category_summary,
+            balances=self.balances,
+            previous=self.previous,
+            year_ago=self.year_ago,
+            rolling=self.rolling,
+        )
         # Aqui chamamos o header específico se a página precisar de algo extra
         self.render_header()
 
@@ -60,6 +290,53 @@ class BasePage(ABC):
         """
         st.markdown(footer_html, unsafe_allow_html=True)
 
+    def _render_debug_panel(self, profile_text=None):
+        """Tempos por etapa e contadores dos caches, para conferir em produção."""
+        if st.query_params.get("debug") != "1" and profile_text is None:
+            return
+        figs = get_figure_cache().stats()
+        filtros = get_filter_engine()
+        with st.sidebar.expander("🛠️ Debug", expanded=True):
+            st.caption(f"Dataset `{self.version}`")
+            c1, c2 = st.columns(2)
+            c1.metric("Figuras (hit)", figs["hits"])
+            c2.metric("Figuras (miss)", figs["misses"])
+            c1.metric("Filtros (hit)", filtros.hits)
+            c2.metric("Filtros (miss)", filtros.misses)
+            st.caption(f"Cache de figuras: {figs['itens']}/{figs['max']} itens")
+            self._render_memory()
+
+            st.caption("Tempo por etapa (ms)")
+            st.dataframe(
+                pd.DataFrame(
+                    {
+                        "etapa": ["· " * d + nome for nome, _, d in self.timer.stages],
+                        "ms": [s * 1000 for _, s, _ in self.timer.stages],
+                    }
+                ),
+                hide_index=True,
+                width="stretch",
+                column_config={"ms": st.column_config.NumberColumn(format="%.1f")},
+            )
+            if profile_text:
+                st.caption("cProfile da rerun (tempo acumulado)")
+                st.code(profile_text, language=None)
+
+    def _render_memory(self):
+        """Memória: o extrato (uma cópia no processo) e o que cada sessão soma."""
+        shared = self.ledger.nbytes if self.ledger is not None else 0
+        mem = get_session_registry().stats(shared)
+        seq = self.ledger.seq if self.ledger is not None else 0
+        c1, c2 = st.columns(2)
+        c1.metric("Extrato (MB)", f"{mem['compartilhado'] / 2**20:.1f}")
+        c2.metric("Sessões", mem["sessoes"])
+        c1.metric("Por sessão (MB)", f"{mem['por_sessao'] / 2**20:.2f}")
+        c2.metric("Só sessões (KB)", f"{mem['proprios'] / 1024:.0f}")
+        st.caption(
+            f"Versão publicada nº {seq}; sessões em {mem['versoes'] or '-'}. "
+            "Todas leem o mesmo extrato, somente leitura."
+        )
+
     @abstractmethod
     def render_header(self):
         """Para títulos secundários ou descrições específicas."""
@@ -10,3 +10,15 @@ PAGE_CONFIG = dict(
     layout="wide",
     page_icon="🦉",
 )
+
+# Modo "série grande": a dispersão com mais de row_threshold linhas e a curva
+# de saldo com mais de max_points datas passam para WebGL e são reduzidas a
+# ~max_points pontos (amostra com extremos no scatter, LTTB na curva).
+LARGE_DATA = {
+    "row_threshold": 5_000,
+    "max_points": 2_000,
+    "extremes_per_category": 5,
+}
+
+# Janela (em meses) da média móvel do saldo líquido no card de saldo
+ROLLING_MONTHS = 3
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: índices de `n_out` pontos que preservam a forma.
+
+    Mantém o primeiro e o último ponto e, em cada balde intermediário, o ponto
+    que forma o maior triângulo com o escolhido antes e a média do próximo
+    balde, então picos e vales da curva sobrevivem ao corte.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Baldes só com os pontos internos; o primeiro e o último ficam fixos
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def sample_with_extremes(
+    df: pd.DataFrame, by: str, value_col: str, n_total: int, n_extremes: int = 5
+) -> pd.DataFrame:
+    """Amostra até ~n_total linhas por grupo, proporcional ao tamanho do grupo.
+
+    Em cada grupo os `n_extremes` maiores e menores valores entram sempre, o
+    resto é amostra uniforme (semente fixa, para a figura não mudar a cada rerun).
+    """
+    if len(df) <= n_total:
+        return df
+
+    rng = np.random.default_rng(0)
+    keep = []
+    for _, grupo in df.groupby(by, observed=True, sort=False):
+        cota = max(2 * n_extremes, round(n_total * len(grupo) / len(df)))
+        if len(grupo) <= cota:
+            keep.append(grupo.index.to_numpy())
+            continue
+        valores = grupo[value_col].to_numpy()
+        ordem = np.argsort(valores, kind="stable")
+        extremos = np.concatenate([ordem[:n_extremes], ordem[-n_extremes:]])
+        resto = np.setdiff1d(np.arange(len(grupo)), extremos, assume_unique=True)
+        sorteio = rng.choice(resto, size=cota - len(extremos), replace=False)
+        keep.append(grupo.index.to_numpy()[np.concatenate([extremos, sorteio])])
+
+    return df.loc[np.sort(np.concatenate(keep))]
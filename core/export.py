@@ -0,0 +1,88 @@
+import importlib.util
+import io
+from functools import partial
+
+import streamlit as st
+
+from data.lru import LRUCache
+
+XLSX_MAX_ROWS = 1_048_575  # limite da planilha do Excel, menos o cabeçalho
+
+
+def _to_csv(df) -> bytes:
+    # Arquivo inteiro em bytes: é o que o ExportCache guarda e o download envia
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding="utf-8-sig")
+    return buf.getvalue()
+
+
+def _to_parquet(df) -> bytes:
+    buf = io.BytesIO()
+    df.to_parquet(buf, index=False)
+    return buf.getvalue()
+
+
+def _to_xlsx(df) -> bytes:
+    buf = io.BytesIO()
+    df.to_excel(buf, index=False, sheet_name="Extrato")
+    return buf.getvalue()
+
+
+def _xlsx_available() -> bool:
+    # pandas escreve XLSX com xlsxwriter (mais rápido) ou, na falta, openpyxl
+    return any(importlib.util.find_spec(m) for m in ("xlsxwriter", "openpyxl"))
+
+
+# rótulo -> (extensão, mime, serializador)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv", _to_csv),
+    "Parquet": ("parquet", "application/vnd.apache.parquet", _to_parquet),
+    "Excel (XLSX)": (
+        "xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        _to_xlsx,
+    ),
+}
+
+
+class ExportCache(LRUCache):
+    """Bytes já serializados por (versão, filtros, formato), limitado em bytes."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(max_bytes=max_bytes)
+
+
+@st.cache_resource
+def get_export_cache() -> ExportCache:
+    """Arquivos já serializados: o segundo clique no mesmo download é um hit."""
+    return ExportCache()
+
+
+def export_bytes(df, fmt: str, cache_key=None) -> bytes:
+    """Serializa df no formato pedido, reaproveitando o cache quando há chave."""
+    serialize = EXPORT_FORMATS[fmt][2]
+    if cache_key is None:
+        return serialize(df)
+    return get_export_cache().get_or_build((cache_key, fmt), partial(serialize, df))
+
+
+def render_export_panel(df, cache_key, file_stem: str, key: str, label: str):
+    """Seletor de formato + download sob demanda.
+
+    Nada é serializado na rerun: o download_button recebe um callable que só
+    roda quando alguém clica, e o resultado fica no ExportCache.
+    """
+    formatos = list(EXPORT_FORMATS)
+    if len(df) > XLSX_MAX_ROWS or not _xlsx_available():
+        formatos.remove("Excel (XLSX)")
+
+    fmt = st.selectbox("Formato", formatos, key=f"{key}_fmt")
+    ext, mime, _ = EXPORT_FORMATS[fmt]
+    st.download_button(
+        label=label,
+        data=partial(export_bytes, df, fmt, cache_key),
+        file_name=f"{file_stem}.{ext}",
+        mime=mime,
+        key=f"{key}_btn",
+        width="stretch",
+    )
@@ -0,0 +1,21 @@
+import streamlit as st
+
+from data.lru import LRUCache
+
+
+class FigureCache(LRUCache):
+    """LRU de figuras Plotly prontas (já com _apply_layout).
+
+    A chave é (versão do dataset, meses, categorias, nome do plot, parâmetros):
+    trocar de aba, alternar o modo do filtro ou voltar a uma seleção anterior
+    reaproveita a figura em vez de reagrupar e remontar o layout.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        super().__init__(maxsize=maxsize)
+
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """Figuras prontas de todas as sessões: a mesma seleção não remonta o gráfico."""
+    return FigureCache()
@@ -1,20 +1,139 @@
 import streamlit as st
 
+from data.lru import LRUCache
+from data.period import PRESETS, filter_by_period, months_in
+from data.schema import codes_mask
+from data.search import tokenize
 
-def apply_sidebar_filters(df):
-    """Lógica global de filtros para o BI com Multiselect auto-populado."""
+
+class FilterEngine:
+    """Filtros memoizados por versão do dataset.
+
+    Guarda as listas de opções (meses/categorias) de cada versão e um LRU de
+    recortes já calculados, chaveado por (versão, meses, categorias). Voltar a
+    uma seleção anterior é um hit de dicionário em vez de varrer e copiar.
+
+    Os recortes são compartilhados entre reruns e sessões. Cada chamada recebe
+    um invólucro raso (copy(deep=False)): com o Copy-on-Write do pandas nenhum
+    dado é copiado, e atribuir/alterar colunas nele não vaza pro cache.
+    """
+
+    def __init__(self, maxsize: int = 32, max_versions: int = 4):
+        self._options = LRUCache(maxsize=max_versions)
+        self._views = LRUCache(maxsize=maxsize)
+
+    @property
+    def hits(self) -> int:
+        return self._views.hits
+
+    @property
+    def misses(self) -> int:
+        return self._views.misses
+
+    def options(self, df, version):
+        """(meses_lista, cats_lista) ordenadas, calculadas uma vez por versão."""
+        return self._options.get_or_build(
+            version,
+            lambda: (
+                sorted(map(str, df["year_month"].unique()), reverse=True),
+                sorted(map(str, df["CATEGORIA"].unique())),
+            ),
+        )
+
+    def filter(
+        self, df, version, meses_sel, cats_sel, periodo=None, busca="", index=None
+    ):
+        """Recorte de df para a seleção; o próprio df quando nada é excluído.
+
+        Com `periodo` (inicio, fim) o recorte é pela janela de datas (busca
+        binária em DATA) e `meses_sel` é ignorado. Com `busca` e o `index`
+        (TokenIndex do ledger) ficam só as linhas com todos os termos.
+        """
+        if df.empty:
+            return df
+        meses_lista, cats_lista = self.options(df, version)
+        termos = frozenset(tokenize(busca)) if busca and index is not None else None
+        key = (version, frozenset(meses_sel), frozenset(cats_sel), periodo, termos)
+
+        def build():
+            if periodo is not None:
+                view = filter_by_period(df, periodo, cats_sel)
+            elif key[1] >= set(meses_lista) and key[2] >= set(cats_lista):
+                view = df  # "Todos" em tudo: nada a filtrar
+            else:
+                view = filter_by_selection(df, meses_sel, cats_sel)
+            if termos:
+                view = view[index.mask(busca, view.index.to_numpy())]
+            return view
+
+        return self._views.get_or_build(key, build).copy(deep=False)
+
+
+@st.cache_resource
+def get_filter_engine() -> FilterEngine:
+    """Opções e recortes da sidebar por versão, reaproveitados entre sessões."""
+    return FilterEngine()
+
+
+def apply_sidebar_filters(df, version=None):
+    """Lógica global de filtros para o BI com Multiselect auto-populado.
+
+    Sem o ledger não há índice de busca: o campo de busca é ignorado aqui.
+    """
     if df.empty:
         return df
 
+    meses_sel, cats_sel, periodo, _ = render_filter_controls(df, version)
+    if version is None:
+        if periodo is not None:
+            return filter_by_period(df, periodo, cats_sel)
+        return filter_by_selection(df, meses_sel, cats_sel)
+    return get_filter_engine().filter(df, version, meses_sel, cats_sel, periodo)
+
+
+def render_filter_controls(df, version=None):
+    """Desenha os filtros da sidebar e devolve (meses, cats, periodo, busca).
+
+    `periodo` é None no filtro por mês; no filtro por período é (inicio, fim)
+    e `meses_sel` traz os meses que a janela toca. `busca` é o texto livre
+    (fornecedor, evento, NF), combinado com os demais filtros.
+    """
+    if df.empty:
+        return [], [], None, ""
+
     with st.sidebar:
         st.header("Filtros:")
 
+        busca = st.text_input(
+            "🔎 Buscar lançamentos",
+            key="global_busca",
+            placeholder="Fornecedor, evento, NF...",
+            help="Descrição e observação, sem acento e sem caixa; "
+            "todos os termos precisam aparecer.",
+        )
+
         # --- CONTROLE DE MODO ---
+        por_periodo = (
+            st.radio(
+                "Filtrar por",
+                ["Mês", "Período"],
+                horizontal=True,
+                key="global_modo",
+            )
+            == "Período"
+        )
         multi_mode = st.toggle("Ativar seleção múltipla", value=False)
 
-        # Preparação das listas
-        meses_lista = sorted(df["year_month"].unique(), reverse=True)
-        cats_lista = sorted(df["CATEGORIA"].unique())
+        # Preparação das listas (cacheadas por versão quando há uma)
+        if version is not None:
+            meses_lista, cats_lista = get_filter_engine().options(df, version)
+        else:
+            meses_lista = sorted(df["year_month"].unique(), reverse=True)
+            cats_lista = sorted(df["CATEGORIA"].unique())
+
+        periodo = None
+        if por_periodo:
+            periodo = render_period_controls(df)
 
         if not multi_mode:
             # ==========================================
@@ -22,14 +141,16 @@ def apply_sidebar_filters(df):
             # ==========================================
             st.subheader("Filtro Rápido")
 
-            sel_m = st.selectbox(
-                "Mês (ano-mês)", ["Todos"] + meses_lista, key="global_m_uni"
-            )
+            if not por_periodo:
+                sel_m = st.selectbox(
+                    "Mês (ano-mês)", ["Todos"] + meses_lista, key="global_m_uni"
+                )
             sel_c = st.selectbox(
                 "Categoria", ["Todos"] + cats_lista, key="global_c_uni"
             )
 
-            meses_sel = meses_lista if sel_m == "Todos" else [sel_m]
+            if not por_periodo:
+                meses_sel = meses_lista if sel_m == "Todos" else [sel_m]
             cats_sel = cats_lista if sel_c == "Todos" else [sel_c]
 
         else:
@@ -39,12 +160,13 @@ def apply_sidebar_filters(df):
             st.subheader("Seleção Manual")
 
             # Aqui o 'default' recebe a lista completa para já vir selecionado
-            ms_m = st.multiselect(
-                "Filtrar Meses",
-                options=meses_lista,
-                default=meses_lista,  # Preenche tudo por padrão
-                key="global_m_multi",
-            )
+            if not por_periodo:
+                ms_m = st.multiselect(
+                    "Filtrar Meses",
+                    options=meses_lista,
+                    default=meses_lista,  # Preenche tudo por padrão
+                    key="global_m_multi",
+                )
 
             ms_c = st.multiselect(
                 "Filtrar Categorias",
@@ -55,10 +177,46 @@ def apply_sidebar_filters(df):
 
             # Garante que se o usuário desmarcar TUDO, o gráfico não quebre (retorna vazio ou todos)
             # Aqui vou manter a lógica de que se estiver vazio, não mostra nada (filtro real)
-            meses_sel = ms_m
+            if not por_periodo:
+                meses_sel = ms_m
             cats_sel = ms_c
 
-    # Retorna o DataFrame já filtrado
+        if por_periodo:
+            meses_sel = months_in(meses_lista, periodo)
+
+    return meses_sel, cats_sel, periodo, busca.strip()
+
+
+def render_period_controls(df):
+    """Atalho (30/90 dias, ano atual) ou intervalo livre; devolve (inicio, fim)."""
+    primeira = df["DATA"].iloc[0].date()
+    ultima = df["DATA"].iloc[-1].date()
+    atalho = st.selectbox(
+        "Período", list(PRESETS) + ["Personalizado"], key="global_periodo"
+    )
+    if atalho in PRESETS:
+        inicio, fim = PRESETS[atalho](ultima)
+        st.caption(f"{inicio:%d/%m/%Y} a {fim:%d/%m/%Y} (até o último lançamento)")
+        return inicio, fim
+
+    datas = st.date_input(
+        "Intervalo",
+        value=(max(primeira, ultima.replace(day=1)), ultima),
+        min_value=primeira,
+        max_value=ultima,
+        format="DD/MM/YYYY",
+        key="global_intervalo",
+    )
+    # Enquanto o usuário escolhe, o widget devolve só a data inicial
+    if not datas:
+        return primeira, ultima
+    if len(datas) == 1:
+        return datas[0], datas[0]
+    return tuple(datas)
+
+
+def filter_by_selection(df, meses_sel, cats_sel):
+    """Aplica a seleção de meses/categorias sobre as linhas (pelos códigos)."""
     return df[
-        (df["year_month"].isin(meses_sel)) & (df["CATEGORIA"].isin(cats_sel))
-    ].copy()
+        codes_mask(df["year_month"], meses_sel) & codes_mask(df["CATEGORIA"], cats_sel)
+    ]
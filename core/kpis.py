@@ -1,16 +1,103 @@
 import streamlit as st
 
 
-def render_kpis(df):
-    # Cálculos base
+def kpi_totals(df, summary=None):
+    """(receitas, despesas) do recorte: do resumo por categoria, senão das linhas."""
+    if summary is not None:
+        return summary["pos_sum"].sum(), summary["neg_sum"].sum()
     receitas = df[df["VALOR_NUM"] > 0]["VALOR_NUM"].sum()
     despesas = df[df["VALOR_NUM"] < 0]["VALOR_NUM"].sum()
+    return receitas, despesas
+
+
+def _delta_box(variacao: float, texto: str, rotulo: str, bom: bool) -> str:
+    """Badge de variação: seta pelo sinal, cor por ser bom ou ruim."""
+    seta = "▲" if variacao >= 0 else "▼"
+    classe = "delta-up" if bom else "delta-down"
+    return (
+        f'<div class="delta-box {classe}">{seta} {texto} '
+        f'<span class="delta-text">{rotulo}</span></div>'
+    )
+
+
+def _vs_anterior(atual: float, anterior: float, rotulo: str, mais_e_bom=True) -> str:
+    """Variação % contra o período anterior (em R$ se a base for zero)."""
+    variacao = atual - anterior
+    if anterior:
+        texto = f"{abs(variacao) / abs(anterior) * 100:.1f}%"
+    else:
+        texto = f"R$ {abs(variacao):,.2f}"
+    return _delta_box(variacao, texto, rotulo, (variacao >= 0) == mais_e_bom)
+
+
+def render_kpis(
+    df, summary=None, balances=None, previous=None, year_ago=None, rolling=None
+):
+    """Cards de entradas, saídas e saldo (e saldo final, com `balances`).
+
+    `previous` = (receitas, despesas, rótulo) do período anterior
+    equivalente: os deltas comparam com ele. Sem ele, os pesos dentro do
+    fluxo do próprio recorte. `year_ago` = (receitas, despesas) dos mesmos
+    meses no ano anterior, num segundo badge; `rolling` = (meses, saldo
+    líquido médio) até o fim do recorte, no card de saldo.
+    """
+    # Cálculos base
+    receitas, despesas = kpi_totals(df, summary)
     saldo_real = receitas + despesas
 
     # Representatividade (Margem sobre Receita)
     p_saldo = (saldo_real / receitas * 100) if receitas > 0 else 0
 
-    c1, c2, c3 = st.columns(3)
+    # Quarto card (saldo inicial -> final do período) quando houver o índice
+    cols = st.columns(3 if balances is None else 4)
+    c1, c2, c3 = cols[:3]
+
+    if previous is not None:
+        # Deltas reais: o mesmo recorte no período anterior equivalente
+        rec_ant, desp_ant, rotulo = previous
+        delta_receitas = _vs_anterior(receitas, rec_ant, rotulo)
+        # Gastar mais é ruim: seta para cima, badge vermelho
+        delta_despesas = _vs_anterior(
+            abs(despesas), abs(desp_ant), rotulo, mais_e_bom=False
+        )
+        variacao = saldo_real - (rec_ant + desp_ant)
+        delta_saldo = _delta_box(
+            variacao, f"R$ {abs(variacao):,.2f}", rotulo, variacao >= 0
+        )
+    else:
+        # Sem período anterior (ex.: todo o histórico): pesos dentro do fluxo
+        fluxo = receitas + abs(despesas)
+        delta_receitas = _delta_box(
+            1,
+            f"{receitas / fluxo * 100 if fluxo > 0 else 0:.1f}%",
+            "do fluxo",
+            True,
+        )
+        consumo = abs(despesas) / receitas * 100 if receitas > 0 else 0
+        delta_despesas = _delta_box(-1, f"{consumo:.1f}%", "consumo", False)
+        delta_saldo = _delta_box(
+            saldo_real, f"{abs(p_saldo):.1f}%", "de margem", saldo_real >= 0
+        )
+
+    # Segundo badge: mesmo recorte no ano anterior (YoY)
+    yoy_receitas = yoy_despesas = yoy_saldo = ""
+    if year_ago is not None:
+        rec_ano, desp_ano = year_ago
+        yoy_receitas = _vs_anterior(receitas, rec_ano, "vs ano anterior")
+        yoy_despesas = _vs_anterior(
+            abs(despesas), abs(desp_ano), "vs ano anterior", mais_e_bom=False
+        )
+        variacao = saldo_real - (rec_ano + desp_ano)
+        yoy_saldo = _delta_box(
+            variacao, f"R$ {abs(variacao):,.2f}", "vs ano anterior", variacao >= 0
+        )
+    # Média móvel do saldo líquido, nos meses até o fim do recorte
+    media_saldo = ""
+    if rolling is not None:
+        meses, media = rolling
+        media_saldo = (
+            f'<div class="delta-text">média {meses} meses: R$ {media:,.2f}</div>'
+        )
 
     # CARD 1: ENTRADAS (Verde)
     c1.markdown(
@@ -18,7 +105,8 @@ def render_kpis(df):
         <div class="kpi-card">
             <div class="kpi-label">ENTRADAS</div>
             <div class="val-receita">R$ {receitas:,.2f}</div>
-            <div class="delta-box delta-up">▲ 100% <span class="delta-text">do fluxo</span></div>
+            {delta_receitas}
+            {yoy_receitas}
         </div>
     """,
         unsafe_allow_html=True,
@@ -30,25 +118,44 @@ def render_kpis(df):
         <div class="kpi-card">
             <div class="kpi-label">SAÍDAS</div>
             <div class="val-despesa">R$ {abs(despesas):,.2f}</div>
-            <div class="delta-box delta-down">▼ {abs(despesas) / receitas * 100 if receitas > 0 else 0:.1f}% <span class="delta-text">consumo</span></div>
+            {delta_despesas}
+            {yoy_despesas}
         </div>
     """,
         unsafe_allow_html=True,
     )
 
-    # CARD 3: SALDO LÍQUIDO (Azul e Seta Corrigida)
-    # Definimos a seta e a cor do badge (delta) baseada no saldo,
-    # mas o valor principal R$ será sempre azul.
-    seta_simbolo = "▲" if saldo_real >= 0 else "▼"
-    classe_delta = "delta-up" if saldo_real >= 0 else "delta-down"
-
+    # CARD 3: SALDO LÍQUIDO (Azul)
+    # O valor principal R$ é sempre azul; só o badge (delta) muda de cor.
     c3.markdown(
         f"""
         <div class="kpi-card">
             <div class="kpi-label">SALDO LÍQUIDO</div>
             <div class="val-saldo">R$ {saldo_real:,.2f}</div>
+            {delta_saldo}
+            {yoy_saldo}
+            {media_saldo}
+        </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    if balances is None:
+        return
+
+    # CARD 4: SALDO FINAL (acumulado de todo o histórico até o fim do recorte)
+    inicial, final = balances
+    variacao = final - inicial
+    seta_simbolo = "▲" if variacao >= 0 else "▼"
+    classe_delta = "delta-up" if variacao >= 0 else "delta-down"
+
+    cols[3].markdown(
+        f"""
+        <div class="kpi-card">
+            <div class="kpi-label">SALDO FINAL</div>
+            <div class="val-saldo">R$ {final:,.2f}</div>
             <div class="delta-box {classe_delta}">
-                {seta_simbolo} {abs(p_saldo):.1f}% <span class="delta-text">de margem</span>
+                {seta_simbolo} R$ {abs(variacao):,.2f} <span class="delta-text">desde R$ {inicial:,.2f}</span>
             </div>
         </div>
     """,
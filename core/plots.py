@@ -1,21 +1,74 @@
+from collections.abc import Callable
+
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from data.cube import summarize_rows
+
+from .config import LARGE_DATA
+from .downsample import lttb, sample_with_extremes
+
 
 class FinanceVisualizer:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        summary: pd.DataFrame | None = None,
+        large_data: dict | None = None,
+        daily_fn: Callable[[], pd.DataFrame] | None = None,
+        opening: float = 0.0,
+    ):
         self.df = df
+        self.large_data = {**LARGE_DATA, **(large_data or {})}
+        # Resumo por categoria vindo do cubo (data.cube); sem ele, é calculado
+        # das linhas numa única passada, na primeira vez que algum gráfico pedir
+        self._summary = summary
+        # Soma por dia para a curva de saldo: da engine de consulta, se houver
+        self._daily_fn = daily_fn
+        self._daily = None
+        # Saldo antes do recorte: a curva de saldo parte dele, não de zero
+        self.opening = opening
+        # Quantas vezes as linhas foram agrupadas por categoria (0 ou 1)
+        self.scans = 0
         self.color_map = self._generate_color_map()
         self.success_color = "#2ecc71"
         self.danger_color = "#e74c3c"
         self.template_color = "#00d2ff"
 
+    @property
+    def summary(self) -> pd.DataFrame:
+        """total, pos_sum, neg_sum, n_pos, n_neg, count e mean por CATEGORIA."""
+        if self._summary is None:
+            self._summary = summarize_rows(self.df)
+            self.scans += 1
+        return self._summary
+
+    @property
+    def daily(self) -> pd.DataFrame:
+        """(DATA, VALOR_NUM) com a soma de cada dia, em ordem de data."""
+        if self._daily is None:
+            if self._daily_fn is not None:
+                self._daily = self._daily_fn()
+            else:
+                self._daily = self.df.groupby("DATA")["VALOR_NUM"].sum().reset_index()
+        return self._daily
+
     def _generate_color_map(self):
-        categorias = sorted(self.df["CATEGORIA"].unique())
+        categorias = sorted(self.summary.index)
         colors = px.colors.qualitative.Prism
         return {cat: colors[i % len(colors)] for i, cat in enumerate(categorias)}
 
+    def _by_category(self, stat: str) -> pd.Series:
+        """Série indexada por CATEGORIA (total, pos_sum, neg_sum, count ou mean)."""
+        s = self.summary
+        # Só entram categorias que de fato têm lançamentos daquele sinal
+        if stat == "pos_sum":
+            return s.loc[s["n_pos"] > 0, stat]
+        if stat == "neg_sum":
+            return s.loc[s["n_neg"] > 0, stat]
+        return s[stat]
+
     def _apply_layout(self, fig: go.Figure, title: str, height: int = 600):
         fig.update_layout(
             height=height,
@@ -54,10 +107,9 @@ class FinanceVisualizer:
         return fig
 
     def plot_analise_pareto(self) -> go.Figure:
-        df_g = self.df[self.df["VALOR_NUM"] < 0].copy()
         df_grouped = (
-            df_g.groupby("CATEGORIA")["VALOR_NUM"]
-            .sum()
+            self._by_category("neg_sum")
+            .rename("VALOR_NUM")
             .abs()
             .sort_values(ascending=False)
             .reset_index()
@@ -96,8 +148,7 @@ class FinanceVisualizer:
 
     def plot_volume_dados(self) -> go.Figure:
         df_count = (
-            self.df.groupby("CATEGORIA")
-            .size()
+            self._by_category("count")
             .reset_index(name="Quantidade")
             .sort_values("Quantidade", ascending=False)
         )
@@ -120,8 +171,8 @@ class FinanceVisualizer:
 
     def plot_ticket_medio(self) -> go.Figure:
         df_mean = (
-            self.df.groupby("CATEGORIA")["VALOR_NUM"]
-            .mean()
+            self._by_category("mean")
+            .rename("VALOR_NUM")
             .abs()
             .sort_values(ascending=False)
             .reset_index()
@@ -146,8 +197,8 @@ class FinanceVisualizer:
 
     def plot_saldo_por_categoria(self) -> go.Figure:
         df_g = (
-            self.df.groupby("CATEGORIA")["VALOR_NUM"]
-            .sum()
+            self._by_category("total")
+            .rename("VALOR_NUM")
             .sort_values(ascending=False)
             .reset_index()
         )
@@ -171,11 +222,9 @@ class FinanceVisualizer:
 
     def plot_ranking(self, tipo="despesa") -> go.Figure:
         is_despesa = tipo == "despesa"
-        filt = self.df["VALOR_NUM"] < 0 if is_despesa else self.df["VALOR_NUM"] > 0
         df_g = (
-            self.df[filt]
-            .groupby("CATEGORIA")["VALOR_NUM"]
-            .sum()
+            self._by_category("neg_sum" if is_despesa else "pos_sum")
+            .rename("VALOR_NUM")
             .abs()
             .sort_values(ascending=False)
             .reset_index()
@@ -196,26 +245,44 @@ class FinanceVisualizer:
         )
 
     def plot_dispersao(self) -> go.Figure:
+        df_s = self.df
+        large = len(df_s) > self.large_data["row_threshold"]
+        if large:
+            # Amostra por categoria, mas maiores/menores lançamentos sempre aparecem
+            df_s = sample_with_extremes(
+                df_s,
+                "CATEGORIA",
+                "VALOR_NUM",
+                self.large_data["max_points"],
+                self.large_data["extremes_per_category"],
+            )
         fig = px.scatter(
-            self.df,
+            df_s,
             x="DATA",
             y="VALOR_NUM",
             color="CATEGORIA",
             color_discrete_map=self.color_map,
-            size=self.df["VALOR_NUM"].abs().fillna(1),
+            size=df_s["VALOR_NUM"].abs().fillna(1),
+            render_mode="webgl" if large else "auto",
         )
         return self._apply_layout(fig, "Análise de Clusters")
 
     def plot_run_chart(self) -> go.Figure:
-        df_run = (
-            self.df.sort_values("DATA")
-            .groupby("DATA")["VALOR_NUM"]
-            .sum()
-            .cumsum()
-            .reset_index()
+        df_run = self.daily.assign(
+            VALOR_NUM=self.daily["VALOR_NUM"].cumsum() + self.opening
         )
+        trace = go.Scatter
+        if len(df_run) > self.large_data["max_points"]:
+            # LTTB preserva picos e vales da curva com bem menos pontos
+            idx = lttb(
+                df_run["DATA"].to_numpy(dtype="int64"),
+                df_run["VALOR_NUM"].to_numpy(),
+                self.large_data["max_points"],
+            )
+            df_run = df_run.iloc[idx]
+            trace = go.Scattergl
         fig = go.Figure(
-            go.Scatter(
+            trace(
                 x=df_run["DATA"],
                 y=df_run["VALOR_NUM"],
                 fill="tozeroy",
@@ -0,0 +1,69 @@
+import sys
+import threading
+import time
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+# Sessão sem rerun há mais que isso sai da contagem
+SESSION_TTL = 30 * 60
+
+
+def _sizeof(value) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
+
+
+def session_nbytes() -> int:
+    """Bytes que só esta sessão segura: os valores do st.session_state."""
+    return sum(_sizeof(v) for v in st.session_state.to_dict().values())
+
+
+class SessionRegistry:
+    """Sessões vistas recentemente e a memória de cada uma, no processo.
+
+    O extrato é um só para todas (Ledger compartilhado): o custo por sessão
+    é a fração dele mais o que a sessão guarda sozinha.
+    """
+
+    def __init__(self, ttl: float = SESSION_TTL):
+        self.ttl = ttl
+        self._sessions = {}  # id -> (visto em, seq do ledger, bytes próprios)
+        self._lock = threading.Lock()
+
+    def touch(self, session_id: str, seq: int, nbytes: int):
+        agora = time.time()
+        with self._lock:
+            self._sessions[session_id] = (agora, seq, nbytes)
+            velhas = [s for s, v in self._sessions.items() if agora - v[0] > self.ttl]
+            for sid in velhas:
+                del self._sessions[sid]
+
+    def stats(self, shared_bytes: int) -> dict:
+        with self._lock:
+            vivas = list(self._sessions.values())
+        n = max(len(vivas), 1)
+        proprios = sum(b for _, _, b in vivas)
+        return {
+            "sessoes": len(vivas),
+            "versoes": sorted({seq for _, seq, _ in vivas}),
+            "compartilhado": shared_bytes,
+            "proprios": proprios,
+            "por_sessao": (shared_bytes + proprios) / n,
+        }
+
+
+@st.cache_resource
+def get_session_registry() -> SessionRegistry:
+    """Sessões vivas do processo, com a versão vista e os bytes de cada uma."""
+    return SessionRegistry()
+
+
+def track_session(ledger) -> int:
+    """Registra esta sessão (versão do ledger que viu e bytes próprios)."""
+    sid = st.session_state.setdefault("_sessao_id", uuid.uuid4().hex)
+    nbytes = session_nbytes()
+    get_session_registry().touch(sid, ledger.seq if ledger is not None else 0, nbytes)
+    return nbytes
@@ -0,0 +1,93 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+
+METRICS_PATH = ".cache/metrics.jsonl"
+# Acima disso o arquivo de métricas é rotacionado para <nome>.1
+METRICS_MAX_BYTES = 10 * 1024 * 1024
+_metrics_lock = threading.Lock()
+
+
+class StageTimer:
+    """Cronômetros leves das etapas de uma rerun (perf_counter, sem amostragem).
+
+    Etapas podem se aninhar; cada uma guarda a profundidade para o painel de
+    debug mostrar a árvore (run > sidebar/header/body > plot_*).
+    """
+
+    def __init__(self):
+        self.stages = []  # (nome, segundos, profundidade), na ordem em que abriram
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        slot = len(self.stages)
+        self.stages.append((name, 0.0, self._depth))
+        self._depth += 1
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.stages[slot] = (name, time.perf_counter() - t0, self._depth)
+
+    def as_dict(self) -> dict:
+        """{etapa: ms}; nomes repetidos (o mesmo gráfico duas vezes) somam."""
+        out = {}
+        for name, secs, _ in self.stages:
+            out[name] = out.get(name, 0.0) + secs * 1000
+        return {k: round(v, 3) for k, v in out.items()}
+
+
+def _metrics_path(requested: bool) -> str:
+    # Desligado por padrão. METRICS_PATH nos secrets grava toda rerun; ?profile=1
+    # (o mesmo opt-in do cProfile) grava só aquela, no caminho padrão.
+    path = st.secrets.get("METRICS_PATH", "")
+    return path or (METRICS_PATH if requested else "")
+
+
+def record_metrics(timer: StageTimer, requested: bool = False, **meta):
+    """Acrescenta uma linha JSON da rerun ao arquivo local de métricas, se ligado."""
+    path = _metrics_path(requested)
+    if not path:
+        return
+    linha = json.dumps(
+        {"ts": time.time(), **meta, "stages_ms": timer.as_dict()}, default=str
+    )
+    path = Path(path)
+    with _metrics_lock:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size > METRICS_MAX_BYTES:
+                os.replace(path, path.with_name(path.name + ".1"))
+            with path.open("a", encoding="utf-8") as f:
+                f.write(linha + "\n")
+        except OSError:
+            pass  # Métrica nunca derruba a página
+
+
+@contextmanager
+def maybe_profile(enabled: bool, limit: int = 30):
+    """cProfile em volta do bloco quando `enabled`; entrega um dict que, ao
+    final, recebe "text" com as funções mais caras por tempo acumulado."""
+    result = {}
+    if not enabled:
+        yield result
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield result
+    finally:
+        prof.disable()
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(limit)
+        result["text"] = buf.getvalue()
@@ -1,3 +1,4 @@
+from .dataset import Ledger
 from .loader import load_and_preprocess_data
 
-__all__ = ["load_and_preprocess_data"]
+__all__ = ["Ledger", "load_and_preprocess_data"]
@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+
+from .schema import codes_mask
+
+CUBE_KEYS = ["year_month", "CATEGORIA"]
+# Meses de defasagem das comparações (linhas do calendário do BalanceIndex)
+MOM, YOY = 1, 12
+SUMMARY_COLS = ["total", "pos_sum", "neg_sum", "n_pos", "n_neg", "count", "mean"]
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrega o extrato uma vez por carga: uma linha por (mês, categoria).
+
+    Colunas: total, pos_sum (receitas), neg_sum (despesas), n_pos, n_neg,
+    count e mean. KPIs e gráficos por categoria saem daqui em vez das linhas.
+    """
+    return _aggregate(df, CUBE_KEYS).reset_index()
+
+
+def summarize_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Mesmo resumo de summarize_categories, direto das linhas, numa só passada."""
+    return _aggregate(df, ["CATEGORIA"])
+
+
+def _aggregate(df: pd.DataFrame, keys) -> pd.DataFrame:
+    if df.empty or "VALOR_NUM" not in df:
+        return pd.DataFrame(columns=keys + SUMMARY_COLS).set_index(keys)
+
+    v = df["VALOR_NUM"]
+    pos, neg = v > 0, v < 0
+    base = pd.DataFrame(
+        {
+            **{k: df[k] for k in keys},
+            "total": v,
+            "pos_sum": v.where(pos, 0.0),
+            "neg_sum": v.where(neg, 0.0),
+            "n_pos": pos.astype("int64"),
+            "n_neg": neg.astype("int64"),
+        }
+    )
+    agg = base.groupby(keys, sort=True, observed=True).agg(
+        total=("total", "sum"),
+        pos_sum=("pos_sum", "sum"),
+        neg_sum=("neg_sum", "sum"),
+        n_pos=("n_pos", "sum"),
+        n_neg=("n_neg", "sum"),
+        count=("total", "size"),
+    )
+    agg["mean"] = agg["total"] / agg["count"]
+    return agg
+
+
+def slice_cube(cube: pd.DataFrame, meses, cats) -> pd.DataFrame:
+    """Recorte do cubo para os meses/categorias selecionados na sidebar."""
+    mask = codes_mask(cube["year_month"], meses) & codes_mask(cube["CATEGORIA"], cats)
+    return cube[mask]
+
+
+def summarize_categories(cube: pd.DataFrame) -> pd.DataFrame:
+    """Colapsa os meses de um recorte: uma linha por CATEGORIA."""
+    s = cube.groupby("CATEGORIA", observed=True)[SUMMARY_COLS[:-1]].sum()
+    s["mean"] = s["total"] / s["count"]
+    return s
+
+
+class BalanceIndex:
+    """Receitas e despesas mensais por categoria, com somas de prefixo.
+
+    `pos[i, c]` e `neg[i, c]` são receitas e despesas da categoria c no
+    i-ésimo mês de um calendário sem buracos (mês sem lançamento vale zero),
+    então deslocar k linhas é voltar k meses. `prefix[i, c]` é a soma de
+    VALOR_NUM da categoria c em todos os meses anteriores ao i-ésimo. Saldo
+    inicial/final, período anterior, mesmo período do ano anterior (12
+    linhas acima), médias móveis e variações saem dessas matrizes, sem varrer
+    o histórico.
+    """
+
+    def __init__(
+        self, months: pd.Index, cats: pd.Index, pos: np.ndarray, neg: np.ndarray
+    ):
+        self.months = months  # aaaa-mm, contínuos
+        self.cats = cats
+        self.pos = pos  # meses x categorias
+        self.neg = neg
+        # (meses + 1) x categorias
+        self.prefix = _prefix(pos + neg)
+
+    @classmethod
+    def from_cube(cls, cube: pd.DataFrame) -> "BalanceIndex":
+        if cube.empty:
+            vazio = np.zeros((0, 0))
+            return cls(pd.Index([]), pd.Index([]), vazio, vazio)
+        periodos = pd.PeriodIndex(cube["year_month"].astype(str), freq="M")
+        calendario = pd.period_range(periodos.min(), periodos.max(), freq="M")
+        cats = pd.Index(sorted(cube["CATEGORIA"].astype(str).unique()))
+
+        rows = periodos.asi8 - calendario[0].ordinal
+        cols = cats.get_indexer(cube["CATEGORIA"].astype(str))
+        pos = np.zeros((len(calendario), len(cats)))
+        neg = np.zeros((len(calendario), len(cats)))
+        np.add.at(pos, (rows, cols), cube["pos_sum"].to_numpy(dtype="float64"))
+        np.add.at(neg, (rows, cols), cube["neg_sum"].to_numpy(dtype="float64"))
+        return cls(pd.Index(calendario.strftime("%Y-%m")), cats, pos, neg)
+
+    @property
+    def nbytes(self) -> int:
+        return self.pos.nbytes + self.neg.nbytes + self.prefix.nbytes
+
+    def _cols(self, cats) -> np.ndarray:
+        idx = self.cats.get_indexer(list(cats))
+        return np.unique(idx[idx >= 0])
+
+    def _rows(self, meses) -> np.ndarray:
+        idx = self.months.get_indexer(list(meses))
+        return np.sort(idx[idx >= 0])
+
+    def before(self, mes: str, cats) -> float:
+        """Saldo das categorias antes do mês `mes` (aaaa-mm), exista ele ou não."""
+        row = int(np.searchsorted(self.months.to_numpy(dtype=str), mes))
+        return float(self.prefix[row, self._cols(cats)].sum())
+
+    def opening(self, meses, cats) -> float:
+        """Saldo das categorias no início do primeiro mês selecionado."""
+        rows = self._rows(meses)
+        if rows.size == 0:
+            return 0.0
+        return float(self.prefix[rows[0], self._cols(cats)].sum())
+
+    def closing(self, meses, cats) -> float:
+        """Saldo das categorias no fim do último mês selecionado."""
+        rows = self._rows(meses)
+        if rows.size == 0:
+            return 0.0
+        return float(self.prefix[rows[-1] + 1, self._cols(cats)].sum())
+
+    # --- Séries (um valor por mês do calendário) ---------------------------
+    def series(self, cats, kind: str = "total") -> np.ndarray:
+        """Receitas ("pos"), despesas ("neg") ou líquido ("total") por mês."""
+        cols = self._cols(cats)
+        if kind == "pos":
+            return self.pos[:, cols].sum(axis=1)
+        if kind == "neg":
+            return self.neg[:, cols].sum(axis=1)
+        return np.diff(self.prefix[:, cols].sum(axis=1))
+
+    def rolling_mean(self, cats, window: int = 3, kind: str = "total") -> np.ndarray:
+        """Média dos últimos `window` meses; NaN enquanto a janela não enche.
+
+        Diferença de somas de prefixo: O(meses), seja qual for a janela.
+        """
+        if kind == "total":
+            cum = self.prefix[:, self._cols(cats)].sum(axis=1)
+        else:
+            cum = _prefix(self.series(cats, kind))
+        out = np.full(len(self.months), np.nan)
+        if 0 < window <= len(out):
+            out[window - 1 :] = (cum[window:] - cum[:-window]) / window
+        return out
+
+    def change(self, cats, lag: int = MOM, kind: str = "total") -> np.ndarray:
+        """Variação % de cada mês contra `lag` meses antes (MOM, YOY)."""
+        return pct_change(self.series(cats, kind), lag)
+
+    # --- Recortes deslocados -----------------------------------------------
+    def shifted(self, meses, cats, lag: int) -> tuple[float, float] | None:
+        """(receitas, despesas) dos meses selecionados, `lag` meses antes.
+
+        None quando o histórico não cobre o recorte deslocado inteiro.
+        """
+        rows = self._rows(meses) - lag
+        if rows.size == 0 or rows[0] < 0:
+            return None
+        sel = np.ix_(rows, self._cols(cats))
+        return float(self.pos[sel].sum()), float(self.neg[sel].sum())
+
+    def previous(self, meses, cats) -> tuple[float, float, int] | None:
+        """(receitas, despesas, meses) do período anterior equivalente.
+
+        A seleção é deslocada pela própria extensão (do primeiro ao último
+        mês): um mês compara com o mês anterior, um trimestre com o trimestre
+        anterior. None quando o histórico não cobre (ex.: "Todos" os meses).
+        """
+        rows = self._rows(meses)
+        if rows.size == 0:
+            return None
+        span = int(rows[-1] - rows[0] + 1)
+        prev = self.shifted(meses, cats, span)
+        return None if prev is None else (*prev, span)
+
+    def year_ago(self, meses, cats) -> tuple[float, float] | None:
+        """(receitas, despesas) dos mesmos meses no ano anterior."""
+        return self.shifted(meses, cats, YOY)
+
+
+def _prefix(a: np.ndarray) -> np.ndarray:
+    """Somas de prefixo ao longo dos meses, com uma linha de zeros no topo."""
+    out = np.zeros((len(a) + 1, *a.shape[1:]))
+    np.cumsum(a, axis=0, out=out[1:])
+    return out
+
+
+def pct_change(valores: np.ndarray, lag: int) -> np.ndarray:
+    """(x[i] - x[i-lag]) / |x[i-lag]| em %, vetorizado; NaN sem base ou base zero."""
+    out = np.full(len(valores), np.nan)
+    if 0 < lag < len(valores):
+        base = valores[:-lag]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[lag:] = np.where(
+                base != 0, (valores[lag:] - base) / np.abs(base) * 100, np.nan
+            )
+    return out
@@ -0,0 +1,106 @@
+import hashlib
+from dataclasses import dataclass
+
+import pandas as pd
+
+from .cube import BalanceIndex, build_cube
+from .schema import freeze_frame
+from .search import TokenIndex
+
+
+@dataclass(frozen=True)
+class Ledger:
+    """Resultado de uma carga: o extrato processado e o que é derivado dele.
+
+    Um único objeto por versão, compartilhado por todas as sessões do
+    processo, e nada nele pode ser alterado: os campos são congelados, os
+    arrays do extrato, do cubo e dos índices são somente leitura e o
+    DataFrame original não sai daqui (`df` entrega um invólucro raso novo a
+    cada acesso).
+    """
+
+    # Extrato original, privado: com outras referências vivas, escrever nele
+    # não esbarra no somente leitura (o Copy-on-Write copia a coluna)
+    _frame: pd.DataFrame
+    mismatch: bool = False
+    cube: pd.DataFrame = None
+    # Saldo inicial/final e período anterior de qualquer recorte (por mês)
+    balances: BalanceIndex = None
+    # Busca por termos em DESCRIÇÃO/OBSERVAÇÃO (posições de linha do df)
+    search: TokenIndex = None
+    # Impressão digital do conteúdo: chave dos caches de filtro/figura/export
+    version: str = ""
+    # Número da publicação no agendador (1, 2, ...); 0 fora dele
+    seq: int = 0
+    # Memória do extrato e das estruturas derivadas (uma cópia no processo)
+    nbytes: int = 0
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """O extrato, num copy(deep=False) só de quem pediu.
+
+        Sem cópia de dados; colunas novas, reordenar ou atribuir valores
+        (Copy-on-Write) ficam no invólucro e nunca chegam às outras sessões.
+        """
+        return self._frame.copy(deep=False)
+
+    @property
+    def empty(self) -> bool:
+        return self._frame.empty
+
+
+def ledger_nbytes(df: pd.DataFrame, cube: pd.DataFrame, *indexes) -> int:
+    """Bytes do extrato (deep: conteúdo do texto) e das estruturas derivadas."""
+    total = int(df.memory_usage(deep=True).sum()) + sum(i.nbytes for i in indexes)
+    return total + int(cube.memory_usage(deep=True).sum())
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """Hash do conteúdo: muda se qualquer linha mudar, igual entre cópias."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()[:16]
+
+
+def _freeze_indexes(balances: BalanceIndex, search: TokenIndex):
+    """Arrays dos índices em somente leitura, como os do extrato."""
+    arrays = [balances.pos, balances.neg, balances.prefix]
+    for seg in search.segments:
+        arrays += [seg.vocab, seg.offsets, seg.postings]
+    for a in arrays:
+        a.flags.writeable = False
+
+
+def build_ledger(
+    df: pd.DataFrame,
+    mismatch: bool = False,
+    previous: Ledger | None = None,
+    appended: int | None = None,
+) -> Ledger:
+    """Monta as estruturas derivadas uma única vez por atualização dos dados.
+
+    Se `df` é o extrato de `previous` com `appended` linhas novas no fim, o
+    índice de busca só tokeniza essas linhas. O ledger divide os arrays com
+    `df` (sem cópia) e os congela: o `df` de quem chamou também vira leitura.
+    """
+    df = freeze_frame(df.copy(deep=False))
+    cube = freeze_frame(build_cube(df))
+    anterior = previous.search if previous is not None else None
+    if (
+        anterior is not None
+        and appended is not None
+        and len(df) == anterior.n_rows + appended
+    ):
+        search = anterior.extend(df)
+    else:
+        search = TokenIndex.build(df)
+    balances = BalanceIndex.from_cube(cube)
+    _freeze_indexes(balances, search)
+    return Ledger(
+        _frame=df,
+        mismatch=mismatch,
+        cube=cube,
+        balances=balances,
+        search=search,
+        version=dataset_fingerprint(df),
+        nbytes=ledger_nbytes(df, cube, balances, search),
+    )
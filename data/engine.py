@@ -0,0 +1,189 @@
+import logging
+import threading
+from abc import ABC, abstractmethod
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .cube import SUMMARY_COLS, slice_cube, summarize_categories
+from .dataset import Ledger
+from .lru import LRUCache
+from .schema import codes_mask
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEngine(ABC):
+    """Agregações do recorte (meses x categorias) para KPIs e gráficos.
+
+    Cada engine responde pelo mesmo contrato, com resultados pequenos:
+    resumo por CATEGORIA (colunas do cubo) e soma de VALOR_NUM por DATA.
+    """
+
+    name = ""
+    # True quando filtro e agregação rodam fora das linhas já filtradas no pandas
+    pushdown = False
+
+    def __init__(self, ledger: Ledger):
+        self.ledger = ledger
+
+    @abstractmethod
+    def category_summary(self, meses, cats) -> pd.DataFrame:
+        """total, pos_sum, neg_sum, n_pos, n_neg, count e mean por CATEGORIA."""
+
+    @abstractmethod
+    def daily_net(self, meses, cats) -> pd.DataFrame:
+        """(DATA, VALOR_NUM): soma dos lançamentos de cada dia, em ordem."""
+
+
+class PandasEngine(QueryEngine):
+    """Resumo pelo cubo mês x categoria; série diária pelas linhas filtradas."""
+
+    name = "pandas"
+
+    def category_summary(self, meses, cats) -> pd.DataFrame:
+        return summarize_categories(slice_cube(self.ledger.cube, meses, cats))
+
+    def daily_net(self, meses, cats) -> pd.DataFrame:
+        df = self.ledger.df
+        if not _seleciona_tudo(df, meses, cats):
+            df = df[
+                codes_mask(df["year_month"], meses) & codes_mask(df["CATEGORIA"], cats)
+            ]
+        return df.groupby("DATA")["VALOR_NUM"].sum().reset_index()
+
+
+class DuckDBEngine(QueryEngine):
+    """DuckDB embutido sobre o extrato: filtro e agregação viram SQL.
+
+    O extrato é registrado como tabela Arrow montada dos próprios arrays do
+    pandas (códigos das categorias, DATA e VALOR_NUM), sem cópia. Os filtros
+    da sidebar descem como listas de códigos inteiros e só o resultado
+    agregado volta para o Python.
+    """
+
+    name = "duckdb"
+    pushdown = True
+
+    def __init__(self, ledger: Ledger):
+        import duckdb
+        import pyarrow as pa
+
+        super().__init__(ledger)
+        df = ledger.df
+        self._meses = df["year_month"].cat.categories
+        self._cats = df["CATEGORIA"].cat.categories
+        tabela = pa.table(
+            {
+                "ym": df["year_month"].cat.codes.to_numpy(),
+                "cat": df["CATEGORIA"].cat.codes.to_numpy(),
+                "DATA": df["DATA"].to_numpy(),
+                "VALOR_NUM": df["VALOR_NUM"].to_numpy(),
+            }
+        )
+        self._con = duckdb.connect(":memory:")
+        self._con.register("extrato", tabela)
+        # Uma conexão por versão, compartilhada entre sessões: consultas em fila
+        self._lock = threading.Lock()
+
+    def _where(self, meses, cats) -> str:
+        if _seleciona_tudo(self.ledger.df, meses, cats):
+            return ""
+        conds = []
+        for col, labels, sel in [("ym", self._meses, meses), ("cat", self._cats, cats)]:
+            codes = labels.get_indexer(list(sel))
+            # Só inteiros saídos do get_indexer entram no SQL
+            lista = ",".join(str(int(c)) for c in np.unique(codes[codes >= 0]))
+            conds.append(f"{col} IN ({lista})" if lista else "FALSE")
+        return "WHERE " + " AND ".join(conds)
+
+    def _query(self, sql: str) -> pd.DataFrame:
+        with self._lock:
+            return self._con.execute(sql).df()
+
+    def category_summary(self, meses, cats) -> pd.DataFrame:
+        # Agrupar por (categoria, sinal) sai mais barato que somas com FILTER;
+        # o resultado tem no máximo 3 linhas por categoria e é pivotado aqui
+        out = self._query(f"""
+            SELECT cat, sign(VALOR_NUM) AS sinal, sum(VALOR_NUM) AS total,
+                   count(*) AS n
+            FROM extrato {self._where(meses, cats)}
+            GROUP BY cat, sinal
+            """)
+        pos, neg = out["sinal"] > 0, out["sinal"] < 0
+        s = (
+            pd.DataFrame(
+                {
+                    "cat": out["cat"],
+                    "total": out["total"],
+                    "pos_sum": out["total"].where(pos, 0.0),
+                    "neg_sum": out["total"].where(neg, 0.0),
+                    "n_pos": out["n"].where(pos, 0),
+                    "n_neg": out["n"].where(neg, 0),
+                    "count": out["n"],
+                }
+            )
+            .groupby("cat", sort=True)
+            .sum()
+            .astype({"n_pos": "int64", "n_neg": "int64", "count": "int64"})
+        )
+        s["mean"] = s["total"] / s["count"]
+        idx = pd.CategoricalIndex(
+            self._cats[s.index.to_numpy()], categories=self._cats, name="CATEGORIA"
+        )
+        return s[SUMMARY_COLS].set_axis(idx)
+
+    def daily_net(self, meses, cats) -> pd.DataFrame:
+        return self._query(f"""
+            SELECT DATA, sum(VALOR_NUM) AS VALOR_NUM
+            FROM extrato {self._where(meses, cats)}
+            GROUP BY DATA ORDER BY DATA
+            """)
+
+
+def _seleciona_tudo(df: pd.DataFrame, meses, cats) -> bool:
+    """Seleção "Todos" em meses e categorias: nada a filtrar."""
+    return set(meses) >= set(df["year_month"].cat.categories) and set(cats) >= set(
+        df["CATEGORIA"].cat.categories
+    )
+
+
+ENGINES = {"pandas": PandasEngine, "duckdb": DuckDBEngine}
+
+
+def make_engine(ledger: Ledger, kind: str = "pandas") -> QueryEngine:
+    """Engine `kind`; sem o pacote duckdb instalado, volta para o pandas."""
+    if kind not in ENGINES:
+        raise ValueError(f"QUERY_ENGINE desconhecido: {kind!r}")
+    try:
+        return ENGINES[kind](ledger)
+    except ImportError:
+        logger.warning("QUERY_ENGINE=%s indisponível; usando pandas", kind)
+        return PandasEngine(ledger)
+
+
+class EngineCache(LRUCache):
+    """LRU de engines por (QUERY_ENGINE, versão do extrato).
+
+    Sem close() no despejo: uma sessão ainda pode estar consultando a versão
+    antiga; a conexão fecha quando o último uso é coletado.
+    """
+
+    def __init__(self, maxsize: int = 2):
+        super().__init__(maxsize=maxsize)
+
+
+@st.cache_resource
+def get_engine_cache() -> EngineCache:
+    """Engines das últimas versões do extrato: o DuckDB registra cada uma uma vez."""
+    return EngineCache()
+
+
+def get_engine(ledger: Ledger) -> QueryEngine:
+    """Engine da versão do extrato (QUERY_ENGINE nos secrets), em LRU."""
+    kind = st.secrets.get("QUERY_ENGINE", "pandas")
+    return get_engine_cache().get_or_build(
+        (kind, ledger.version), partial(make_engine, ledger, kind)
+    )
@@ -1,8 +1,20 @@
-import gspread
+import numpy as np
 import pandas as pd
 import streamlit as st
-from oauth2client.service_account import ServiceAccountCredentials
-from typing import Tuple, List
+from pathlib import Path
+
+from .dataset import Ledger, build_ledger
+from .schema import compact_frame
+from .scheduler import RefreshScheduler
+from .snapshot import load_snapshot, save_snapshot, snapshot_age
+from .sources import (
+    FILE_SOURCES,
+    DataSource,
+    ParquetSource,
+    SheetsSource,
+    SQLiteSource,
+)
+from .workbook import Workbook
 
 EXPECTED_COLS = [
     "DATA",
@@ -14,8 +26,23 @@ EXPECTED_COLS = [
     "SALDO",
 ]
 
+# O fetch lê só as colunas do extrato (n_cols = len(EXPECTED_COLS), A:G) com
+# valores crus: VALOR chega como número e DATA como serial, sem parse de texto
+# formatado. Strings da API (= gspread.utils.ValueRenderOption/DateTimeOption),
+# para não importar o gspread antes do primeiro fetch
+FETCH_OPTS = {
+    "value_render_option": "UNFORMATTED_VALUE",
+    "date_time_render_option": "SERIAL_NUMBER",
+}
+
 
+@st.cache_resource
 def get_gspread_client():
+    """Cliente autorizado, um por processo (credenciais montadas uma vez)."""
+    # Imports pesados só no primeiro fetch, não na partida do servidor
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
     scopes = [
         "https://www.googleapis.com/auth/spreadsheets",
         "https://www.googleapis.com/auth/drive",
@@ -42,24 +69,147 @@ def parse_money(val) -> float:
     try:
         return float(s)
     except:  # noqa: E722
-        return 0.0 
+        return 0.0
+
+
+# Subconjunto do que float() aceita; o resto ("1_000", "nan", lixo) vai pro float().
+_PLAIN_NUMBER = r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?"
+_MAYBE_NUMBER = r"[0-9]|[nN][aA][nN]|[iI][nN][fF]|[^\x00-\x7f]"
+
+
+def parse_money_series(values) -> pd.Series:
+    """Versão vetorizada de parse_money: mesma saída, uma passada pela coluna.
+
+    Números (células lidas sem formatação) passam direto; só texto é parseado.
+    """
+    s = pd.Series(values, copy=False)
+    numeric = _numeric_mask(s)
+    if numeric.all():
+        return pd.Series(
+            pd.to_numeric(s).astype("float64").fillna(0.0).to_numpy(),
+            index=s.index,
+            name=s.name,
+        )
+    if numeric.any():
+        out = parse_money_series(s.where(~numeric, ""))
+        out[numeric] = pd.to_numeric(s[numeric]).astype("float64").fillna(0.0)
+        return out
+
+    txt = s.astype("string")
+    blank = (txt.isna() | (txt == "")).to_numpy(dtype=bool, na_value=True)
+
+    txt = (
+        txt.fillna("")
+        .str.strip()
+        .str.replace("R$", "", regex=False)
+        .str.replace(".", "", regex=False)
+        .str.replace(" ", "", regex=False)
+        .str.replace(",", ".", regex=False)
+    )
+    neg = (txt.str.startswith("(") & txt.str.endswith(")")).to_numpy(dtype=bool)
+    if neg.any():
+        txt[neg] = "-" + txt[neg].str.strip("()")
+
+    # Só o que casa com _PLAIN_NUMBER vai pro cast em bloco (arredondamento
+    # correto, igual ao float()); o resto passa pelo float() original.
+    plain = txt.str.fullmatch(_PLAIN_NUMBER).to_numpy(dtype=bool)
+    numbers = txt.where(plain, "0")
+    if getattr(numbers.dtype, "storage", None) == "pyarrow":
+        numbers = numbers.astype("float64[pyarrow]")
+    out = numbers.to_numpy(dtype="float64", copy=True)
+
+    # Sem dígito nenhum (e sem nan/inf), float() certamente falha: já é 0.0
+    pending = ~plain & ~blank
+    if pending.any():
+        pending &= txt.str.contains(_MAYBE_NUMBER).to_numpy(dtype=bool)
+        out[pending] = [_to_float(v) for v in txt[pending]]
+    return pd.Series(out, index=s.index, name=s.name)
 
 
-def process_data_logic(values: List[List[str]]) -> Tuple[pd.DataFrame, bool]:
+def _numeric_mask(s: pd.Series) -> np.ndarray:
+    """Quais células já vieram como número (int/float), não como texto."""
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return np.zeros(len(s), dtype=bool)
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return np.ones(len(s), dtype=bool)
+    kind = pd.api.types.infer_dtype(s, skipna=True)
+    if kind in ("string", "empty", "boolean"):
+        return np.zeros(len(s), dtype=bool)
+    if kind in ("integer", "floating", "mixed-integer-float"):
+        return s.notna().to_numpy()
+    return s.map(
+        lambda v: isinstance(v, (int, float)) and not isinstance(v, bool)
+    ).to_numpy(dtype=bool)
+
+
+# Dia zero das datas seriais do Google Sheets (mesmo do Excel/Lotus)
+_SHEETS_EPOCH = pd.Timestamp("1899-12-30")
+
+
+def parse_dates(values) -> pd.Series:
+    """DATA como datetime: serial do Sheets, texto dd/mm/aaaa ou ISO aaaa-mm-dd."""
+    s = pd.Series(values, copy=False)
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return s  # Fontes locais (Parquet/SQLite) podem já trazer datas
+    numeric = _numeric_mask(s)
+    serial = _SHEETS_EPOCH + pd.to_timedelta(pd.to_numeric(s.where(numeric)), unit="D")
+    if numeric.all():
+        return serial
+    text = s.where(~numeric)
+    out = pd.to_datetime(text, dayfirst=True, errors="coerce")
+    # Texto ISO (aaaa-mm-dd, comum em CSV/SQLite) não pode passar pelo dayfirst
+    iso = text.astype("string").str.match(r"\d{4}-\d{2}-\d{2}").fillna(False)
+    if iso.any():
+        out = out.where(~iso, pd.to_datetime(text.where(iso), format="ISO8601"))
+    return out.where(~numeric, serial)
+
+
+def _to_float(s: str) -> float:
+    try:
+        return float(s)
+    except ValueError:
+        return 0.0
+
+
+def _year_month(data: pd.Series) -> pd.Categorical:
+    """'AAAA-MM' como category: formata uma vez por mês, não por linha."""
+    codes, meses = pd.factorize(data.dt.year * 100 + data.dt.month, sort=True)
+    labels = [f"{m // 100:04d}-{m % 100:02d}" for m in meses]
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+
+def process_data_logic(values: list[list[str]]) -> tuple[pd.DataFrame, bool]:
     if not values or len(values) < 2:
         return pd.DataFrame(columns=EXPECTED_COLS), False
 
     header = [str(h).strip() for h in values[1]]
     mismatch = not all(col in header for col in EXPECTED_COLS)
     df = pd.DataFrame(values[2:], columns=header if not mismatch else None)
+    return _process(df, mismatch), mismatch
+
 
+def process_frame(raw: pd.DataFrame) -> tuple[pd.DataFrame, bool]:
+    """process_data_logic para linhas que já chegam em DataFrame (fontes locais).
+
+    `raw` tem as colunas da planilha pelo nome; sem elas, vale a posição.
+    """
+    raw = raw.rename(columns=lambda c: str(c).strip())
+    mismatch = not all(col in raw.columns for col in EXPECTED_COLS)
+    return _process(raw, mismatch), mismatch
+
+
+def _process(df: pd.DataFrame, mismatch: bool) -> pd.DataFrame:
     if mismatch:
-        df = pd.DataFrame(values[2:]).iloc[:, : len(EXPECTED_COLS)]
-        df.columns = EXPECTED_COLS
+        df = df.iloc[:, : len(EXPECTED_COLS)].set_axis(EXPECTED_COLS, axis=1)
 
-    df["DATA"] = pd.to_datetime(df["DATA"], dayfirst=True, errors="coerce")
+    df["DATA"] = parse_dates(df["DATA"])
     df = df.dropna(subset=["DATA"]).copy()
-    df["VALOR_NUM"] = df["VALOR"].apply(parse_money)
+    df["VALOR_NUM"] = parse_money_series(df["VALOR"])
+    # Colunas cruas: sem formatação podem vir número misturado com texto/"",
+    # o que o Parquet do snapshot não aceita. Só essas viram texto.
+    for col in ["VALOR", "SALDO"]:
+        if df[col].dtype == object:
+            df[col] = df[col].fillna("").astype(str)
 
     for col in ["TIPO", "CATEGORIA", "DESCRIÇÃO", "OBSERVAÇÃO"]:
         df[col] = df[col].fillna("N/D").astype(str).str.strip().replace("", "N/D")
@@ -71,20 +221,127 @@ def process_data_logic(values: List[List[str]]) -> Tuple[pd.DataFrame, bool]:
     mask_receita = df["TIPO"].str.contains("Receita", case=False)
     df.loc[mask_receita, "VALOR_NUM"] = df.loc[mask_receita, "VALOR_NUM"].abs()
 
-    df = df.sort_values("DATA").reset_index(drop=True)
+    # Estável: no mesmo dia mantém a ordem da planilha (a carga incremental usa isso)
+    df = df.sort_values("DATA", kind="stable").reset_index(drop=True)
     df["Saldo Acumulado"] = df["VALOR_NUM"].cumsum()
-    df["year_month"] = df["DATA"].dt.to_period("M").astype(str)
+    df["year_month"] = _year_month(df["DATA"])
+
+    return compact_frame(df)
+
+
+SNAPSHOT_PATH = ".cache/ledger.parquet"
+
+
+def _snapshot_path() -> str:
+    return st.secrets.get("SNAPSHOT_PATH", SNAPSHOT_PATH)
+
+
+def _worksheet_refs(config) -> list:
+    """Abas a carregar, da mais antiga para a atual (índices ou títulos).
+
+    WORKSHEETS lista uma aba por ano fiscal; sem ela, vale WORKSHEET_INDEX.
+    """
+    refs = config.get("WORKSHEETS")
+    return list(refs) if refs else [int(config.get("WORKSHEET_INDEX", 0))]
+
+
+def make_source(config) -> DataSource:
+    """Origem escolhida por DATA_SOURCE: sheets (padrão), csv, parquet, sqlite.
+
+    As locais leem DATA_PATH; a sqlite aceita DATA_TABLE ou DATA_QUERY.
+    """
+    kind = str(config.get("DATA_SOURCE", "sheets")).lower()
+    if kind == "sheets":
+        # Snapshots por aba ficam ao lado do snapshot do extrato completo
+        abas = Path(config.get("SNAPSHOT_PATH", SNAPSHOT_PATH)).parent / "abas"
+        workbook = Workbook(
+            process_data_logic,
+            n_cols=len(EXPECTED_COLS),
+            fetch_opts=FETCH_OPTS,
+            snapshot_dir=abas,
+            incremental=config.get("INCREMENTAL_SYNC", True),
+        )
+        return SheetsSource(
+            get_gspread_client,
+            workbook,
+            _worksheet_refs(config),
+            spreadsheet_key=config.get("SPREADSHEET_KEY"),
+            spreadsheet_name=config.get("SPREADSHEET_NAME"),
+            # Cliente em cache_resource: sem limpar, o mesmo cliente quebrado volta
+            reset_client=get_gspread_client.clear,
+        )
+    if kind not in FILE_SOURCES:
+        raise ValueError(f"DATA_SOURCE desconhecido: {kind!r}")
 
+    path = config["DATA_PATH"]
+    if kind == "parquet":
+        return ParquetSource(path, process_frame, columns=EXPECTED_COLS)
+    if kind == "sqlite":
+        return SQLiteSource(
+            path,
+            process_frame,
+            table=config.get("DATA_TABLE", "lancamentos"),
+            query=config.get("DATA_QUERY"),
+        )
+    return FILE_SOURCES[kind](path, process_frame)
+
+
+@st.cache_resource
+def get_source() -> DataSource:
+    """Origem configurada nos secrets, uma por processo (guarda handles/estado)."""
+    return make_source(st.secrets)
+
+
+def fetch_and_process() -> tuple[pd.DataFrame, bool]:
+    """Carrega da origem configurada, processa e atualiza o snapshot local."""
+    source = get_source()
+    df, mismatch = source.load()
+    save_snapshot(_snapshot_path(), df, mismatch, state={"source": source.key})
     return df, mismatch
 
 
-@st.cache_data(ttl=600)
-def load_and_preprocess_data() -> Tuple[pd.DataFrame, bool]:
-    try:
-        client = get_gspread_client()
-        sh = client.open(st.secrets["SPREADSHEET_NAME"])
-        ws = sh.get_worksheet(int(st.secrets.get("WORKSHEET_INDEX", 0)))
-        return process_data_logic(ws.get_all_values())
-    except Exception as e:
-        st.error(f"Erro ao carregar: {e}")
-        return pd.DataFrame(columns=EXPECTED_COLS), False
+def _fetch_ledger(previous: Ledger | None = None) -> Ledger:
+    df, mismatch = fetch_and_process()
+    # Carga incremental: o índice de busca só recebe as linhas novas
+    return build_ledger(
+        df, mismatch, previous=previous, appended=get_source().last_appended
+    )
+
+
+@st.cache_resource
+def get_scheduler() -> RefreshScheduler:
+    """Agendador único do processo; começa do snapshot em disco, se houver."""
+    sched = RefreshScheduler(
+        _fetch_ledger, interval=float(st.secrets.get("REFRESH_INTERVAL", 600))
+    )
+    snap = load_snapshot(_snapshot_path())
+    source = get_source()
+    # Snapshot de outra origem (DATA_SOURCE mudou) não serve; sem "source" é
+    # um snapshot antigo, sempre da planilha
+    if snap is not None and snap[2]["state"].get("source", "sheets") == source.key:
+        df, mismatch, meta = snap
+        source.restore()
+        sched.seed(build_ledger(df, mismatch), fetched_at=meta["fetched_at"])
+        # Snapshot velho: a primeira atualização sai já, em background
+        sched.start(first_delay=sched.interval - snapshot_age(meta))
+    return sched
+
+
+def load_and_preprocess_data() -> Ledger:
+    """Ledger atual do agendador; a rerun nunca espera a planilha.
+
+    Só a primeira carga do processo, sem snapshot em disco, busca na hora;
+    reruns que chegam durante essa busca ficam com o resultado dela. Se ela
+    falha, a thread sobe mesmo assim e segue tentando com backoff, e as
+    reruns não buscam de novo enquanto a janela de espera não fecha.
+    Depois a thread do agendador troca os dados e a versão nova vale a partir
+    da rerun seguinte. Todas as sessões recebem o mesmo objeto (somente
+    leitura), sem o pickle/cópia por chamada do st.cache_data.
+    """
+    sched = get_scheduler()
+    if sched.version == 0 and (sched.in_backoff() or not sched.refresh_now()):
+        sched.start()
+        st.error(f"Erro ao carregar: {sched.last_error}")
+        return build_ledger(pd.DataFrame(columns=EXPECTED_COLS))
+    sched.start()
+    return sched.current()[1]
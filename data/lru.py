@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+
+class LRUCache:
+    """LRU thread-safe, limitado em itens (`maxsize`) e/ou em bytes (`max_bytes`).
+
+    `get_or_build` monta o valor fora do lock: um build lento não trava os
+    hits das outras sessões. Se duas sessões montam a mesma chave ao mesmo
+    tempo, fica o primeiro valor inserido e as duas devolvem ele. Com
+    `max_bytes`, o tamanho de cada valor vem de `sizeof`; valor maior que o
+    limite inteiro é devolvido sem entrar no cache.
+    """
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable = len,
+    ):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._items = OrderedDict()  # chave -> (valor, bytes)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build: Callable):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            self.misses += 1
+
+        value = build()
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._items:
+                # Outra sessão montou a mesma chave enquanto isso: fica a dela
+                self._items.move_to_end(key)
+                return self._items[key][0]
+            self._items[key] = (value, size)
+            self.nbytes += size
+            self._evict()
+        return value
+
+    def _evict(self):
+        while (self.maxsize is not None and len(self._items) > self.maxsize) or (
+            self.max_bytes is not None and self.nbytes > self.max_bytes
+        ):
+            _, (_, size) = self._items.popitem(last=False)
+            self.nbytes -= size
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "itens": len(self._items),
+                "max": self.maxsize,
+            }
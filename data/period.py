@@ -0,0 +1,85 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from .dataset import Ledger
+from .schema import codes_mask
+
+Period = tuple[datetime.date, datetime.date]
+
+# Atalhos do filtro por período, contados a partir do último lançamento
+PRESETS = {
+    "Últimos 30 dias": lambda ref: (ref - datetime.timedelta(days=29), ref),
+    "Últimos 90 dias": lambda ref: (ref - datetime.timedelta(days=89), ref),
+    "Ano atual (YTD)": lambda ref: (ref.replace(month=1, day=1), ref),
+}
+
+
+def date_window(df: pd.DataFrame, inicio, fim) -> tuple[int, int]:
+    """(i0, i1) das linhas com inicio <= DATA <= fim, por busca binária.
+
+    O loader entrega o extrato ordenado por DATA: duas buscas O(log n) em vez
+    de comparar a data de todas as linhas.
+    """
+    datas = df["DATA"].to_numpy()
+    limites = np.array(
+        [pd.Timestamp(inicio), pd.Timestamp(fim) + pd.Timedelta(days=1)],
+        dtype=datas.dtype,
+    )
+    i0, i1 = np.searchsorted(datas, limites, side="left")
+    return int(i0), int(i1)
+
+
+def filter_by_period(df: pd.DataFrame, periodo: Period, cats) -> pd.DataFrame:
+    """Linhas do período e das categorias; a máscara só roda dentro da janela."""
+    i0, i1 = date_window(df, *periodo)
+    janela = df.iloc[i0:i1]
+    return janela[codes_mask(janela["CATEGORIA"], cats)]
+
+
+def months_in(meses, periodo: Period) -> list:
+    """Rótulos aaaa-mm (de `meses`) que o período toca."""
+    de, ate = (d.strftime("%Y-%m") for d in periodo)
+    return [m for m in meses if de <= m <= ate]
+
+
+def period_balances(ledger: Ledger, periodo: Period, cats) -> tuple[float, float]:
+    """(saldo inicial, saldo final) das categorias no período.
+
+    Saldo até o mês de início vem do índice de prefixos; só os dias do mês
+    antes do início e as linhas do próprio período são somados.
+    """
+    df = ledger.df
+    inicio = pd.Timestamp(periodo[0])
+    mes = inicio.strftime("%Y-%m")
+    # Sem índice (ledger montado à mão), o mês começa do zero
+    abertura = ledger.balances.before(mes, cats) if ledger.balances is not None else 0.0
+
+    i_mes = date_window(df, inicio.replace(day=1), inicio)[0]
+    i0, i1 = date_window(df, *periodo)
+    antes = df.iloc[i_mes:i0]
+    janela = df.iloc[i0:i1]
+    abertura += antes.loc[codes_mask(antes["CATEGORIA"], cats), "VALOR_NUM"].sum()
+    fluxo = janela.loc[codes_mask(janela["CATEGORIA"], cats), "VALOR_NUM"].sum()
+    return float(abertura), float(abertura + fluxo)
+
+
+def previous_period(
+    ledger: Ledger, periodo: Period, cats
+) -> tuple[float, float, int] | None:
+    """(receitas, despesas, dias) dos mesmos tantos dias logo antes do período.
+
+    Duas buscas binárias e a soma só das linhas dessa janela; None quando o
+    extrato não cobre a janela anterior inteira.
+    """
+    df = ledger.df
+    inicio, fim = (pd.Timestamp(d) for d in periodo)
+    dias = (fim - inicio).days + 1
+    de = inicio - pd.Timedelta(days=dias)
+    if df.empty or de < df["DATA"].iloc[0]:
+        return None
+    i0, i1 = date_window(df, de, inicio - pd.Timedelta(days=1))
+    janela = df.iloc[i0:i1]
+    v = janela.loc[codes_mask(janela["CATEGORIA"], cats), "VALOR_NUM"]
+    return float(v[v > 0].sum()), float(v[v < 0].sum()), dias
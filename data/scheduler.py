@@ -0,0 +1,158 @@
+import dataclasses
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+
+import streamlit as st
+
+from .dataset import Ledger
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """Atualiza o Ledger numa thread do processo, fora das reruns.
+
+    `refresh_fn(anterior)` busca e processa a origem e devolve um Ledger novo
+    (recebe o publicado, ou None, para reaproveitar o que não mudou); a troca
+    é uma atribuição sob lock, então quem lê sempre vê uma versão inteira.
+    Intervalo com jitter (instâncias não batem na API juntas) e backoff
+    exponencial enquanto a origem falhar.
+    """
+
+    def __init__(
+        self,
+        refresh_fn: Callable[[Ledger | None], Ledger],
+        interval: float = 600,
+        jitter: float = 0.1,
+        retry_base: float = 30,
+        max_backoff: float = 3600,
+    ):
+        self.refresh_fn = refresh_fn
+        self.interval = interval
+        self.jitter = jitter
+        self.retry_base = retry_base
+        self.max_backoff = max_backoff
+
+        self._current: tuple[int, Ledger | None] = (0, None)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+
+        self.last_refresh = None  # time.time() da última troca bem-sucedida
+        self.last_duration = None
+        self.last_error = None
+        self.failures = 0  # falhas seguidas (zera no sucesso)
+        self.total_failures = 0
+        self.next_run = None
+        self.retry_at = None  # antes disso, reruns não tentam buscar de novo
+        self._attempts = 0  # tentativas concluídas (com sucesso ou não)
+
+    @property
+    def version(self) -> int:
+        return self._current[0]
+
+    def current(self) -> tuple[int, Ledger | None]:
+        """(versão, Ledger) lidos juntos: nunca um par de trocas diferentes."""
+        return self._current
+
+    def seed(self, ledger: Ledger, fetched_at: float | None = None):
+        """Publica um Ledger já pronto (ex.: snapshot em disco) sem buscar."""
+        self._swap(ledger)
+        self.last_refresh = fetched_at or time.time()
+
+    def _swap(self, ledger: Ledger):
+        with self._lock:
+            seq = self._current[0] + 1
+            # O Ledger é imutável: o número da versão vai numa cópia rasa
+            self._current = (seq, dataclasses.replace(ledger, seq=seq))
+
+    def in_backoff(self) -> bool:
+        """Origem falhando e a janela de espera ainda aberta."""
+        return bool(self.failures) and time.time() < (self.retry_at or 0)
+
+    def refresh_now(self) -> bool:
+        """Busca e troca agora. Se outra thread já está buscando, espera ela
+        e fica com o resultado dela (sucesso ou falha), sem buscar de novo."""
+        attempt = self._attempts
+        with self._refresh_lock:
+            if self._attempts != attempt:
+                return self.last_error is None
+            t0 = time.perf_counter()
+            try:
+                ledger = self.refresh_fn(self._current[1])
+            except Exception as e:  # noqa: BLE001
+                # Qualquer erro da origem (rede, API, planilha fora do formato)
+                # só abre o backoff: a thread e o Ledger publicado seguem de pé
+                self._attempts += 1
+                self.failures += 1
+                self.total_failures += 1
+                self.last_error = str(e)
+                self.retry_at = time.time() + self._backoff()
+                logger.warning(
+                    "Falha ao atualizar dados (%d seguidas): %s", self.failures, e
+                )
+                return False
+            self._swap(ledger)
+            self._attempts += 1
+            self.last_duration = time.perf_counter() - t0
+            self.last_refresh = time.time()
+            self.last_error = None
+            self.failures = 0
+            self.retry_at = None
+            return True
+
+    def _backoff(self) -> float:
+        # Origem falhando: 30s, 60s, 120s... até max_backoff
+        return min(self.retry_base * 2 ** (self.failures - 1), self.max_backoff)
+
+    def _delay(self) -> float:
+        base = self._backoff() if self.failures else self.interval
+        return base * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def start(self, first_delay: float | None = None):
+        """Sobe a thread (idempotente). `first_delay` antecipa a 1ª atualização."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        delay = self._delay() if first_delay is None else max(first_delay, 0)
+        self.next_run = time.time() + delay
+        self._thread = threading.Thread(
+            target=self._loop, name="caec-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(max(self.next_run - time.time(), 0))
+            self.refresh_now()
+            self.next_run = time.time() + self._delay()
+
+    def status(self) -> dict:
+        return {
+            "version": self.version,
+            "last_refresh": self.last_refresh,
+            "last_duration": self.last_duration,
+            "failures": self.failures,
+            "total_failures": self.total_failures,
+            "last_error": self.last_error,
+            "next_run": self.next_run,
+        }
+
+
+def render_refresh_status(status: dict):
+    """Rodapé da sidebar: quando os dados foram atualizados e se há falhas."""
+    if status["last_refresh"] is None:
+        st.caption("🔄 Dados ainda não carregados.")
+        return
+    atualizado = time.strftime("%d/%m %H:%M", time.localtime(status["last_refresh"]))
+    linha = f"🔄 Atualizado em {atualizado}"
+    if status["last_duration"] is not None:
+        linha += f" ({status['last_duration']:.1f}s)"
+    st.caption(linha)
+    if status["failures"]:
+        st.caption(
+            f"⚠️ {status['failures']} falha(s) seguida(s) na atualização "
+            f"({status['total_failures']} no total)"
+        )
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# Colunas de baixa cardinalidade: viram category (códigos int8/int16 + rótulos)
+CATEGORICAL_COLS = ["TIPO", "CATEGORIA", "year_month"]
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Esquema compacto do extrato processado.
+
+    TIPO/CATEGORIA/year_month como category (rótulos ordenados) e
+    VALOR_NUM/Saldo Acumulado em float64. Filtros e agregações por mês usam
+    os códigos de year_month: não há coluna de mês à parte.
+    """
+    for col in CATEGORICAL_COLS:
+        if col in df and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = _as_category(df[col])
+    for col in ["VALOR_NUM", "Saldo Acumulado"]:
+        if col in df:
+            df[col] = df[col].astype("float64")
+    return df
+
+
+def _labels(s: pd.Series) -> set:
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return set(s.cat.categories)
+    return set(s.dropna().unique())
+
+
+def _as_category(s: pd.Series, labels=None) -> pd.Series:
+    labels = _labels(s) if labels is None else labels
+    return s.astype(pd.CategoricalDtype(sorted(str(x) for x in labels)))
+
+
+def concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """pd.concat preservando as categorias (concat puro degrada para object)."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+
+    out = pd.concat(frames, ignore_index=True)
+    for col in CATEGORICAL_COLS:
+        if col in out:
+            labels = set().union(*(_labels(f[col]) for f in frames if col in f))
+            out[col] = _as_category(out[col], labels)
+    return out
+
+
+def codes_mask(s: pd.Series, selected) -> np.ndarray:
+    """Equivalente a s.isin(selected), mas por lookup nos códigos da categoria."""
+    if not isinstance(s.dtype, pd.CategoricalDtype):
+        return s.isin(selected).to_numpy()
+    wanted = s.cat.categories.get_indexer(list(selected))
+    lookup = np.zeros(len(s.cat.categories) + 1, dtype=bool)
+    lookup[wanted[wanted >= 0]] = True
+    # Código -1 (NaN) cai na última posição, que é sempre False
+    return lookup[s.cat.codes.to_numpy()]
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Marca os arrays numpy de `df` como somente leitura (no próprio df).
+
+    Escrita nos valores (df.loc[...] = x, to_numpy()[i] = x) passa a levantar
+    ValueError. Quem precisa alterar trabalha num df.copy(deep=False): com o
+    Copy-on-Write a coluna alterada é copiada e o original segue intacto.
+    Texto (Arrow) já é imutável.
+
+    Depende do pandas 3.x (fixado no requirements.txt): Copy-on-Write ligado
+    e os blocos internos (df._mgr.blocks, Categorical._codes, ._ndarray).
+    Se esses internos sumirem numa atualização, falha aqui com um erro claro
+    em vez de publicar um extrato sem a proteção.
+    """
+    try:
+        # Pelos blocos: colunas float vizinhas dividem um só array 2D
+        blocks = df._mgr.blocks
+        arrays = []
+        for block in blocks:
+            values = block.values
+            if isinstance(values, pd.Categorical):
+                values = values._codes
+            arrays.append(getattr(values, "_ndarray", values))  # datas
+    except AttributeError as e:
+        raise RuntimeError(
+            f"freeze_frame não suporta o pandas {pd.__version__} (feito para 3.x): {e}"
+        ) from e
+    for values in arrays:
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+    return df
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Bytes por coluna e por linha (deep=True conta o conteúdo das strings)."""
+    usage = df.memory_usage(deep=True, index=False)
+    rows = max(len(df), 1)
+    return pd.DataFrame(
+        {
+            "dtype": df.dtypes.astype(str),
+            "bytes": usage,
+            "bytes_por_linha": usage / rows,
+        }
+    )
@@ -0,0 +1,169 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+SEARCH_FIELDS = ["DESCRIÇÃO", "OBSERVAÇÃO"]
+# Acima disso os segmentos do índice são fundidos num só
+MAX_SEGMENTS = 8
+
+
+def _fold(texts: pa.Array) -> pa.Array:
+    """Minúsculas e sem acento ("Manutenção" -> "manutencao"), no Arrow."""
+    nfkd = pc.utf8_normalize(texts.fill_null(""), "NFKD")
+    return pc.utf8_lower(pc.replace_substring_regex(nfkd, r"\p{Mn}+", ""))
+
+
+def _tokens(texts: pa.Array):
+    """(tokens, posição do texto de origem) de todos os textos, sem laço Python."""
+    partes = pc.split_pattern_regex(_fold(texts), r"[^a-z0-9]+")
+    tokens = pc.list_flatten(partes)
+    origem = pc.list_parent_indices(partes)
+    cheios = pc.not_equal(tokens, "")
+    return tokens.filter(cheios), origem.filter(cheios).to_numpy()
+
+
+def tokenize(text: str) -> list[str]:
+    """Termos de uma busca, com a mesma normalização do índice."""
+    return _tokens(pa.array([str(text)]))[0].to_pylist()
+
+
+class _Segment:
+    """Listas invertidas de um trecho de linhas, em formato CSR.
+
+    `vocab` ordenado; as linhas do token vocab[i] são
+    postings[offsets[i]:offsets[i + 1]], crescentes. Termos com o mesmo
+    prefixo ficam vizinhos no vocab: um prefixo é uma fatia contígua.
+    """
+
+    __slots__ = ("offsets", "postings", "vocab")
+
+    def __init__(self, vocab: np.ndarray, offsets: np.ndarray, postings: np.ndarray):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.postings = postings
+
+    def prefix(self, term: str) -> np.ndarray:
+        """Linhas (com repetição) de todos os tokens que começam com `term`."""
+        lo = np.searchsorted(self.vocab, term, side="left")
+        hi = np.searchsorted(self.vocab, term + "\uffff", side="left")
+        return self.postings[self.offsets[lo] : self.offsets[hi]]
+
+
+class TokenIndex:
+    """Índice invertido (sem acento, sem caixa) de DESCRIÇÃO e OBSERVAÇÃO.
+
+    Guarda posições de linha do extrato (df.iloc). Cada termo da busca casa
+    por prefixo ("forn" acha "fornecedor") e os termos se combinam com E.
+    Linhas novas no fim do extrato viram um segmento novo; só elas são
+    tokenizadas. É imutável: `extend` devolve outro índice, e quem ainda usa
+    a versão anterior não vê linhas que não existem no seu df.
+    """
+
+    def __init__(self, segments: list[_Segment], n_rows: int):
+        self.segments = segments
+        self.n_rows = n_rows
+
+    @property
+    def nbytes(self) -> int:
+        """Memória do índice (listas, offsets e os textos do vocabulário)."""
+        return sum(
+            seg.offsets.nbytes
+            + seg.postings.nbytes
+            + seg.vocab.nbytes
+            + sum(map(sys.getsizeof, seg.vocab))
+            for seg in self.segments
+        )
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "TokenIndex":
+        return cls([], 0).extend(df)
+
+    def extend(self, df: pd.DataFrame) -> "TokenIndex":
+        """Índice de `df`, que são as linhas já indexadas + novas no fim."""
+        novas = _segment(df, self.n_rows)
+        segments = self.segments + ([novas] if novas is not None else [])
+        if len(segments) > MAX_SEGMENTS:
+            segments = [_merge(segments)]
+        return TokenIndex(segments, len(df))
+
+    def query(self, text: str) -> np.ndarray | None:
+        """Máscara (uma posição por linha) com todos os termos; None sem termos."""
+        terms = tokenize(text)
+        if not terms:
+            return None
+        hits = np.ones(self.n_rows, dtype=bool)
+        marcadas = np.empty(self.n_rows, dtype=bool)
+        # Bitmaps em vez de unir/intersectar listas: O(linhas + postings)
+        for term in set(terms):
+            marcadas.fill(False)
+            for seg in self.segments:
+                marcadas[seg.prefix(term)] = True
+            hits &= marcadas
+        return hits
+
+    def mask(self, text: str, positions: np.ndarray) -> np.ndarray | None:
+        """Máscara booleana para as linhas `positions` (None: busca vazia)."""
+        hits = self.query(text)
+        return None if hits is None else hits[positions]
+
+
+def _segment(df: pd.DataFrame, start: int) -> _Segment | None:
+    """Tokeniza as linhas df[start:] (DESCRIÇÃO e OBSERVAÇÃO)."""
+    cols = [c for c in SEARCH_FIELDS if c in df]
+    if start >= len(df) or not cols:
+        return None
+    tokens, rows = [], []
+    for col in cols:
+        textos = pa.array(df[col].iloc[start:].astype("string"))
+        if isinstance(textos, pa.ChunkedArray):  # colunas vindas de um concat
+            textos = textos.combine_chunks()
+        t, r = _tokens(textos)
+        tokens.append(t)
+        rows.append(r)
+    tokens, rows = pa.concat_arrays(tokens), np.concatenate(rows)
+    if len(tokens) == 0:
+        return None
+    vocab, ids = _vocab_ids(tokens)
+    # Um par (token, linha) por ocorrência: repetidos saem aqui, em ordem de linha
+    chave = np.sort(ids.astype(np.int64) * (len(df) - start) + rows)
+    chave = chave[np.concatenate([[True], chave[1:] != chave[:-1]])]
+    ids, rows = np.divmod(chave, len(df) - start)
+    return _Segment(vocab, _offsets(ids, len(vocab)), (rows + start).astype(np.int32))
+
+
+def _offsets(ids: np.ndarray, n_tokens: int) -> np.ndarray:
+    offsets = np.zeros(n_tokens + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ids, minlength=n_tokens), out=offsets[1:])
+    return offsets
+
+
+def _vocab_ids(tokens: pa.Array):
+    """(vocabulário ordenado, id de cada token nele).
+
+    O dicionário do Arrow acha os distintos por hash; só eles são ordenados.
+    """
+    enc = pc.dictionary_encode(tokens)
+    ordem = pc.array_sort_indices(enc.dictionary).to_numpy()
+    rank = np.empty_like(ordem)
+    rank[ordem] = np.arange(len(ordem))
+    vocab = enc.dictionary.take(ordem).to_numpy(zero_copy_only=False)
+    return vocab, rank[enc.indices.to_numpy()]
+
+
+def _merge(segments: list[_Segment]) -> _Segment:
+    """Um segmento só; os segmentos vêm em ordem de linha e não se repetem."""
+    vocab, ids = _vocab_ids(
+        pa.concat_arrays([pa.array(seg.vocab, pa.string()) for seg in segments])
+    )
+    fim = np.cumsum([len(seg.vocab) for seg in segments])
+    por_posting = [
+        np.repeat(ids[f - len(seg.vocab) : f], np.diff(seg.offsets))
+        for seg, f in zip(segments, fim)
+    ]
+    ids = np.concatenate(por_posting)
+    rows = np.concatenate([seg.postings for seg in segments])
+    ordem = np.argsort(ids, kind="stable")  # estável: linhas seguem em ordem
+    return _Segment(vocab, _offsets(ids, len(vocab)), rows[ordem])
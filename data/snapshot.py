@@ -0,0 +1,55 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+_META_KEY = b"caec_snapshot"
+
+
+def save_snapshot(path, df: pd.DataFrame, mismatch: bool, state: dict | None = None):
+    """Grava o df processado em Parquet, com os metadados no próprio schema.
+
+    Escreve num arquivo temporário e troca com os.replace, então quem lê
+    nunca pega um snapshot pela metade.
+    """
+    meta = {
+        "fetched_at": time.time(),
+        "rows": len(df),
+        "mismatch": bool(mismatch),
+        "state": state or {},
+    }
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _META_KEY: json.dumps(meta).encode()}
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+
+def load_snapshot(path) -> tuple[pd.DataFrame, bool, dict] | None:
+    """(df, mismatch, meta) do snapshot, ou None se faltar ou estiver ilegível."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        table = pq.read_table(path)
+        meta = json.loads(table.schema.metadata[_META_KEY])
+        df = table.to_pandas()
+        mismatch = meta["mismatch"]
+    except (OSError, ValueError, KeyError, TypeError, pa.ArrowException):
+        # Arquivo truncado, Parquet de outra origem ou metadados antigos
+        return None
+    return df, mismatch, meta
+
+
+def snapshot_age(meta: dict) -> float:
+    """Segundos desde que o snapshot foi buscado na origem."""
+    return time.time() - meta.get("fetched_at", 0)
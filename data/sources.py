@@ -0,0 +1,178 @@
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+
+from .sync import Processed
+from .workbook import Workbook
+
+
+class DataSource(ABC):
+    """Origem do extrato.
+
+    `load()` devolve (df processado, mismatch), pronto para o build_ledger.
+    `key` identifica a origem no snapshot em disco: trocar de origem nos
+    secrets não reaproveita o snapshot de outra.
+    """
+
+    key = ""
+
+    @abstractmethod
+    def load(self) -> Processed:
+        pass
+
+    @property
+    def last_appended(self) -> int | None:
+        """Linhas novas no fim do df em relação à carga anterior (None: não se
+        sabe, o df pode ter mudado inteiro)."""
+        return None
+
+    def restore(self):
+        """Retoma estado incremental do disco (só quem tem estado sobrescreve)."""
+
+
+class SheetsSource(DataSource):
+    """Google Sheets: uma aba por ano fiscal, via Workbook (paralelo + incremental).
+
+    Planilha e abas são resolvidas uma vez e reaproveitadas; qualquer falha
+    descarta os handles para a próxima tentativa resolver de novo e chama
+    `reset_client` (ex.: limpar o cliente em cache), para que uma credencial
+    expirada seja refeita sem reiniciar o processo.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable,
+        workbook: Workbook,
+        refs: list,
+        spreadsheet_key: str | None = None,
+        spreadsheet_name: str | None = None,
+        reset_client: Callable | None = None,
+    ):
+        self.client_factory = client_factory
+        self.reset_client = reset_client
+        self.workbook = workbook
+        self.refs = refs
+        self.spreadsheet_key = spreadsheet_key
+        self.spreadsheet_name = spreadsheet_name
+        self.key = "sheets"
+        self._sh = None
+        self._worksheets = {}
+        self._lock = threading.Lock()
+
+    def _spreadsheet(self):
+        with self._lock:
+            if self._sh is None:
+                client = self.client_factory()
+                if self.spreadsheet_key:
+                    self._sh = client.open_by_key(self.spreadsheet_key)
+                else:
+                    self._sh = client.open(self.spreadsheet_name)
+            return self._sh
+
+    def worksheet(self, ref):
+        """Handle de uma aba, por índice ou título."""
+        if ref not in self._worksheets:
+            sh = self._spreadsheet()
+            ws = sh.get_worksheet(ref) if isinstance(ref, int) else sh.worksheet(ref)
+            self._worksheets[ref] = ws
+        return self._worksheets[ref]
+
+    def load(self) -> Processed:
+        try:
+            return self.workbook.refresh(self.refs, self.worksheet)
+        except Exception:
+            # Handles podem ter ficado inválidos (aba apagada, token revogado)
+            with self._lock:
+                self._sh = None
+                self._worksheets = {}
+                if self.reset_client is not None:
+                    self.reset_client()
+            raise
+
+    @property
+    def last_appended(self) -> int | None:
+        return self.workbook.last_appended
+
+    def restore(self):
+        self.workbook.restore(self.refs)
+
+
+class FileSource(DataSource):
+    """Arquivo local com as colunas da planilha (cabeçalho na 1ª linha).
+
+    Sem rede: serve para testes de carga, benchmarks e como dublê da planilha.
+    """
+
+    def __init__(self, path, process_frame: Callable[[pd.DataFrame], Processed]):
+        self.path = Path(path)
+        self.process_frame = process_frame
+        self.key = f"{type(self).__name__}:{self.path.resolve()}"
+
+    def load(self) -> Processed:
+        return self.process_frame(self.read())
+
+    @abstractmethod
+    def read(self) -> pd.DataFrame:
+        """Linhas cruas, com as colunas como estão no arquivo."""
+
+
+class CSVSource(FileSource):
+    """CSV exportado da planilha. Tipos inferidos: números passam direto e
+    texto formatado ("R$ 1.234,56", "31/12/2024") vai pelo parse da planilha."""
+
+    def read(self) -> pd.DataFrame:
+        return pd.read_csv(self.path, keep_default_na=False, na_values=[""])
+
+
+class ParquetSource(FileSource):
+    """Parquet lido com memory map (o SO pagina o arquivo, sem cópia de leitura)."""
+
+    def __init__(self, path, process_frame, columns: list[str] | None = None):
+        super().__init__(path, process_frame)
+        self.columns = columns
+
+    def read(self) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+
+        cols = None
+        if self.columns:
+            # Só as colunas do extrato que existem no arquivo
+            schema = pq.read_schema(self.path, memory_map=True)
+            cols = [c for c in self.columns if c in schema.names] or None
+        return pq.read_table(self.path, columns=cols, memory_map=True).to_pandas()
+
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class SQLiteSource(FileSource):
+    """Tabela (ou consulta) de um arquivo SQLite, aberto somente leitura."""
+
+    def __init__(
+        self,
+        path,
+        process_frame,
+        table: str = "lancamentos",
+        query: str | None = None,
+    ):
+        super().__init__(path, process_frame)
+        if query is None and not _IDENT.match(table):
+            raise ValueError(f"Nome de tabela inválido: {table!r}")
+        self.query = query or f'SELECT * FROM "{table}"'
+        self.key += f":{self.query}"
+
+    def read(self) -> pd.DataFrame:
+        con = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            return pd.read_sql_query(self.query, con)
+        finally:
+            con.close()
+
+
+# DATA_SOURCE nos secrets -> classe (as locais recebem DATA_PATH)
+FILE_SOURCES = {"csv": CSVSource, "parquet": ParquetSource, "sqlite": SQLiteSource}
@@ -0,0 +1,161 @@
+import hashlib
+import threading
+from collections.abc import Callable
+
+import pandas as pd
+
+from .schema import concat_frames
+
+Values = list[list[str]]
+# (df processado, mismatch): o que process_fn e as origens devolvem
+Processed = tuple[pd.DataFrame, bool]
+
+
+def _col_letter(n: int) -> str:
+    """1 -> A, 7 -> G, 27 -> AA."""
+    letters = ""
+    while n > 0:
+        n, r = divmod(n - 1, 26)
+        letters = chr(65 + r) + letters
+    return letters
+
+
+def fetch_values(ws, n_cols: int | None = None, fetch_opts=None) -> Values:
+    """Valores brutos do worksheet: todas as colunas ou só as `n_cols` primeiras."""
+    fetch_opts = fetch_opts or {}
+    if n_cols is None:
+        return ws.get_all_values(**fetch_opts)
+    return ws.get_values(f"A:{_col_letter(n_cols)}", **fetch_opts)
+
+
+class IncrementalSync:
+    """Sincronização append-only da planilha.
+
+    Guarda quantas linhas brutas já foram processadas (watermark) e um hash das
+    últimas `tail_rows` delas. Na próxima carga busca só do rabo em diante: se o
+    rabo bate, processa apenas as linhas novas e concatena; se não bate (edição
+    ou exclusão acima do watermark), recarrega tudo.
+    """
+
+    def __init__(
+        self,
+        process_fn: Callable[[Values], Processed],
+        tail_rows: int = 5,
+        full_every: int = 12,
+        n_cols: int | None = None,
+        fetch_opts: dict | None = None,
+    ):
+        self.process_fn = process_fn
+        self.tail_rows = tail_rows
+        # Largura lida da planilha (None = todas as colunas) e opções do fetch
+        self.n_cols = n_cols
+        self.fetch_opts = fetch_opts or {}
+        # Rede de segurança: edições bem acima do rabo não mudam o hash
+        self.full_every = full_every
+
+        self.df: pd.DataFrame | None = None
+        self.mismatch = False
+        self.watermark = 0
+        self.tail_hash: str | None = None
+        self.last_appended: int | None = None
+
+        self._head: Values = []
+        self._since_full = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def refresh(self, ws) -> Processed:
+        """Atualiza a partir do worksheet e devolve (df, mismatch)."""
+        with self._lock:
+            if self.df is None or self._since_full >= self.full_every:
+                self._full_reload(self._fetch_all(ws))
+            else:
+                self._incremental(ws)
+            return self.df, self.mismatch
+
+    def _fetch_all(self, ws) -> Values:
+        return fetch_values(ws, self.n_cols, self.fetch_opts)
+
+    def _full_reload(self, values: Values):
+        self.df, self.mismatch = self.process_fn(values)
+        self._head = [list(r) for r in values[:2]]
+        self._mark(values)
+        self._since_full = 0
+        self.last_appended = None
+
+    def _incremental(self, ws):
+        start = max(self.watermark - self.tail_rows, len(self._head))
+        fetched = ws.get_values(
+            f"A{start + 1}:{_col_letter(self._width)}", **self.fetch_opts
+        )
+        overlap = self.watermark - start
+
+        if len(fetched) < overlap or self._hash(fetched[:overlap]) != self.tail_hash:
+            self._full_reload(self._fetch_all(ws))
+            return
+
+        new_rows = fetched[overlap:]
+        self._since_full += 1
+        self.last_appended = 0
+        if not new_rows:
+            return
+
+        df_new, _ = self.process_fn(self._head + [list(r) for r in new_rows])
+        self._append(df_new)
+        self.watermark += len(new_rows)
+        self.tail_hash = self._hash(fetched[-self.tail_rows :])
+
+    def _append(self, df_new: pd.DataFrame):
+        if df_new.empty:
+            return
+
+        df_old = self.df
+        if df_old.empty or df_new["DATA"].iloc[0] >= df_old["DATA"].iloc[-1]:
+            # Caso normal: linhas novas são as mais recentes, o saldo só continua
+            offset = df_old["Saldo Acumulado"].iloc[-1] if not df_old.empty else 0.0
+            df_new["Saldo Acumulado"] = df_new["Saldo Acumulado"] + offset
+            self.df = concat_frames([df_old, df_new])
+            self.last_appended = len(df_new)
+        else:
+            # Lançamento retroativo: reordena e refaz o saldo, sem refazer o fetch
+            df = concat_frames([df_old, df_new])
+            df = df.sort_values("DATA", kind="stable").reset_index(drop=True)
+            df["Saldo Acumulado"] = df["VALOR_NUM"].cumsum()
+            self.df = df
+            self.last_appended = None
+
+    def state(self) -> dict:
+        """Estado serializável (vai junto do snapshot em disco)."""
+        return {
+            "watermark": self.watermark,
+            "tail_hash": self.tail_hash,
+            "head": self._head,
+            "since_full": self._since_full,
+        }
+
+    def restore(self, df: pd.DataFrame, mismatch: bool, state: dict):
+        """Retoma a partir de um snapshot, sem precisar de carga completa."""
+        with self._lock:
+            if self.df is not None or not state.get("head"):
+                return
+            self.df, self.mismatch = df, mismatch
+            self.watermark = state["watermark"]
+            self.tail_hash = state["tail_hash"]
+            self._head = state["head"]
+            self._since_full = state.get("since_full", 0)
+
+    # ------------------------------------------------------------------
+    @property
+    def _width(self) -> int:
+        w = max(len(self._head[1]) if len(self._head) > 1 else 0, 1)
+        return min(w, self.n_cols) if self.n_cols else w
+
+    def _mark(self, values: Values):
+        self.watermark = len(values)
+        self.tail_hash = self._hash(values[len(self._head) :][-self.tail_rows :])
+
+    def _hash(self, rows: Values) -> str:
+        # Normaliza a largura: o fetch do rabo pode vir mais curto que o completo
+        w = self._width
+        norm = [[str(c) for c in r[:w]] + [""] * (w - len(r[:w])) for r in rows]
+        return hashlib.sha1(repr(norm).encode("utf-8")).hexdigest()
@@ -0,0 +1,136 @@
+import threading
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .lru import LRUCache
+
+TABLE_COLS = ["DATA", "CATEGORIA", "DESCRIÇÃO", "VALOR_NUM"]
+SEARCH_COLS = ["DESCRIÇÃO", "CATEGORIA"]
+SORT_LABELS = {
+    "DATA": "Data",
+    "VALOR_NUM": "Valor",
+    "CATEGORIA": "Categoria",
+    "DESCRIÇÃO": "Descrição",
+}
+
+
+class LedgerTable:
+    """Extrato paginado no servidor.
+
+    Ordena cada coluna uma única vez (argsort estável, guardado por coluna) e
+    a partir daí só faz gathers: busca filtra a ordem já pronta e a página é
+    uma fatia dela. O navegador recebe `page_size` linhas, não o histórico.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._order = {}
+        self._haystack = None
+        self._last_query = (None, None)
+        self._lock = threading.Lock()
+
+    def order(self, col: str, ascending: bool = True) -> np.ndarray:
+        """Posições das linhas ordenadas por `col` (calculadas uma vez)."""
+        with self._lock:
+            if col not in self._order:
+                self._order[col] = np.argsort(_sort_key(self.df[col]), kind="stable")
+            asc = self._order[col]
+        return asc if ascending else asc[::-1]
+
+    def search_mask(self, query: str) -> np.ndarray:
+        """Máscara das linhas cujo DESCRIÇÃO/CATEGORIA contém `query`."""
+        query = query.strip().casefold()
+        with self._lock:
+            if self._last_query[0] == query:
+                return self._last_query[1]
+            if self._haystack is None:
+                parts = [self.df[c].astype(str) for c in SEARCH_COLS]
+                self._haystack = parts[0].str.cat(parts[1:], sep=" | ").str.casefold()
+        mask = self._haystack.str.contains(query, regex=False).to_numpy(dtype=bool)
+        with self._lock:
+            self._last_query = (query, mask)
+        return mask
+
+    def count(self, query: str = "") -> int:
+        """Quantas linhas casam com a busca (todas, se vazia)."""
+        if not query.strip():
+            return len(self.df)
+        return int(self.search_mask(query).sum())
+
+    def page(
+        self,
+        sort_col: str = "DATA",
+        ascending: bool = False,
+        query: str = "",
+        page: int = 1,
+        page_size: int = 100,
+    ) -> tuple[pd.DataFrame, int]:
+        """(linhas da página, total de linhas que casaram com a busca)."""
+        pos = self.order(sort_col, ascending)
+        if query.strip():
+            pos = pos[self.search_mask(query)[pos]]
+        start = (max(page, 1) - 1) * page_size
+        return self.df.iloc[pos[start : start + page_size]], len(pos)
+
+
+def _sort_key(s: pd.Series) -> np.ndarray:
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy()  # categorias já estão em ordem alfabética
+    if s.dtype == object or isinstance(s.dtype, pd.StringDtype):
+        return s.fillna("").astype(str).str.casefold().to_numpy(dtype=object)
+    return s.to_numpy()
+
+
+class TableCache(LRUCache):
+    """LRU de LedgerTable por (versão, filtros): ordens e índice de busca prontos."""
+
+    def __init__(self, maxsize: int = 8):
+        super().__init__(maxsize=maxsize)
+
+
+@st.cache_resource
+def get_table_cache() -> TableCache:
+    """Tabelas das últimas seleções: paginar e ordenar não refaz os argsorts."""
+    return TableCache()
+
+
+def get_table(df: pd.DataFrame, cache_key=None) -> LedgerTable:
+    """LedgerTable reaproveitada por chave (versão + filtros), em LRU."""
+    if cache_key is None:
+        return LedgerTable(df)
+    return get_table_cache().get_or_build(cache_key, partial(LedgerTable, df))
+
+
+def render_ledger_table(table: LedgerTable, key: str, page_size: int = 100):
+    """Controles de busca/ordenação/página + st.dataframe só com a página atual."""
+    c_busca, c_ordem, c_sentido = st.columns([3, 2, 1])
+    query = c_busca.text_input(
+        "Buscar", key=f"{key}_q", placeholder="Descrição ou categoria"
+    )
+    sort_col = c_ordem.selectbox(
+        "Ordenar por",
+        list(SORT_LABELS),
+        format_func=SORT_LABELS.get,
+        key=f"{key}_sort",
+    )
+    ascending = c_sentido.toggle("Crescente", value=False, key=f"{key}_asc")
+
+    total = table.count(query)
+    paginas = max(1, -(-total // page_size))
+    # Busca nova pode encolher o total: volta para a última página válida
+    if st.session_state.get(f"{key}_p", 1) > paginas:
+        st.session_state[f"{key}_p"] = paginas
+    pagina = st.number_input(
+        "Página", min_value=1, max_value=paginas, step=1, key=f"{key}_p"
+    )
+
+    rows, total = table.page(sort_col, ascending, query, int(pagina), page_size)
+    st.dataframe(rows[TABLE_COLS], width="stretch", height=600, hide_index=True)
+    inicio = (int(pagina) - 1) * page_size
+    st.caption(
+        f"Mostrando {min(inicio + 1, total)}–{min(inicio + page_size, total)} "
+        f"de {total} lançamentos · página {int(pagina)} de {paginas}"
+    )
@@ -0,0 +1,153 @@
+import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import pairwise
+from pathlib import Path
+
+import pandas as pd
+
+from .schema import concat_frames
+from .snapshot import load_snapshot, save_snapshot
+from .sync import IncrementalSync, Processed, Values, fetch_values
+
+
+class Workbook:
+    """Extrato de várias abas (uma por ano fiscal), buscadas em paralelo.
+
+    A última aba da lista é o ano corrente: sincroniza a cada carga (de forma
+    incremental, se ligado). As anteriores são anos fechados: buscadas uma vez,
+    guardadas em memória e em snapshot por aba, e nunca mais pedidas à API.
+    O resultado junta as abas em ordem e refaz o Saldo Acumulado global.
+    """
+
+    def __init__(
+        self,
+        process_fn: Callable[[Values], Processed],
+        n_cols: int | None = None,
+        fetch_opts: dict | None = None,
+        snapshot_dir=None,
+        incremental: bool = True,
+        max_workers: int = 4,
+    ):
+        self.process_fn = process_fn
+        self.n_cols = n_cols
+        self.fetch_opts = fetch_opts or {}
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.incremental = incremental
+        self.max_workers = max_workers
+
+        self._closed: dict[str, Processed] = {}
+        self._syncs: dict[str, IncrementalSync] = {}
+        self._lock = threading.Lock()
+        self.last_appended: int | None = None
+
+    def refresh(self, refs: list, open_ws: Callable) -> Processed:
+        """Atualiza as abas `refs` (em ordem cronológica) e devolve (df, mismatch).
+
+        `open_ws(ref)` resolve o worksheet; só é chamado para abas que
+        realmente vão à API.
+        """
+        with self._lock:
+            *closed, current = refs
+            novas = [r for r in closed if _key(r) not in self._closed]
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(self.max_workers, len(novas) + 1))
+            ) as pool:
+                futs = {r: pool.submit(self._load_closed, r, open_ws) for r in novas}
+                aberta = pool.submit(self._load_open, current, open_ws)
+                for r, fut in futs.items():
+                    self._closed[_key(r)] = fut.result()
+                parts = [self._closed[_key(r)] for r in closed] + [aberta.result()]
+
+            frames = [p[0] for p in parts]
+            df = combine(frames)
+            sync = self._syncs.get(_key(current))
+            # Linhas novas só seguem no fim do df global se nada antes mudou
+            intacto = sync is not None and not novas and _in_order(frames)
+            self.last_appended = sync.last_appended if intacto else None
+            return df, any(p[1] for p in parts)
+
+    def _fetch(self, ws) -> Values:
+        return fetch_values(ws, self.n_cols, self.fetch_opts)
+
+    def _load_closed(self, ref, open_ws) -> Processed:
+        snap = self._load_snapshot(ref)
+        if snap is not None:
+            return snap[0], snap[1]
+        df, mismatch = self.process_fn(self._fetch(open_ws(ref)))
+        self._save_snapshot(ref, df, mismatch)
+        return df, mismatch
+
+    def _load_open(self, ref, open_ws) -> Processed:
+        ws = open_ws(ref)
+        if not self.incremental:
+            df, mismatch = self.process_fn(self._fetch(ws))
+            self._save_snapshot(ref, df, mismatch)
+            return df, mismatch
+
+        sync = self._syncs.get(_key(ref))
+        if sync is None:
+            sync = self._syncs[_key(ref)] = self._new_sync()
+        df, mismatch = sync.refresh(ws)
+        self._save_snapshot(ref, df, mismatch, state=sync.state())
+        return df, mismatch
+
+    def _new_sync(self) -> IncrementalSync:
+        return IncrementalSync(
+            self.process_fn, n_cols=self.n_cols, fetch_opts=self.fetch_opts
+        )
+
+    def restore(self, refs: list):
+        """Retoma das snapshots por aba: fechadas em memória, aberta na sync."""
+        with self._lock:
+            *closed, current = refs
+            for ref in closed:
+                snap = self._load_snapshot(ref)
+                if snap is not None:
+                    self._closed.setdefault(_key(ref), (snap[0], snap[1]))
+            snap = self._load_snapshot(current)
+            if snap is not None and self.incremental:
+                df, mismatch, meta = snap
+                sync = self._syncs.setdefault(_key(current), self._new_sync())
+                sync.restore(df, mismatch, meta["state"])
+
+    # ------------------------------------------------------------------
+    def _path(self, ref) -> Path | None:
+        if self.snapshot_dir is None:
+            return None
+        nome = re.sub(r"[^\w.-]", "_", _key(ref))
+        return self.snapshot_dir / f"{nome}.parquet"
+
+    def _load_snapshot(self, ref):
+        path = self._path(ref)
+        return load_snapshot(path) if path is not None else None
+
+    def _save_snapshot(self, ref, df, mismatch, state=None):
+        path = self._path(ref)
+        if path is not None:
+            save_snapshot(path, df, mismatch, state=state)
+
+
+def _key(ref) -> str:
+    return str(ref)
+
+
+def _in_order(frames: list[pd.DataFrame]) -> bool:
+    """Cada aba já vem ordenada: basta comparar as fronteiras entre elas."""
+    cheios = [f for f in frames if not f.empty]
+    return all(a["DATA"].iloc[-1] <= b["DATA"].iloc[0] for a, b in pairwise(cheios))
+
+
+def combine(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Junta os extratos das abas (já em ordem) com saldo acumulado global."""
+    cheios = [f for f in frames if not f.empty]
+    if len(cheios) <= 1:
+        return cheios[0] if cheios else frames[-1]
+
+    df = concat_frames(cheios)
+    if not _in_order(cheios):
+        # Abas que se sobrepõem (lançamento de um ano na aba do outro)
+        df = df.sort_values("DATA", kind="stable").reset_index(drop=True)
+    df["Saldo Acumulado"] = df["VALOR_NUM"].cumsum()
+    return df
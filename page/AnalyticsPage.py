@@ -1,7 +1,7 @@
 from core import (
     st,
     BasePage,
-    FinanceVisualizer,
+    render_export_panel,
 )
 
 
@@ -21,46 +21,49 @@ class AnalyticsPage(BasePage):
 
     def render_body(self):
         """Layout focado em análise 80/20 e volume com suporte a stretch."""
-        viz = FinanceVisualizer(self.df_f)
-
-        tab1, tab2, tab3 = st.tabs(
-            [
-                "🎯 Performance & Saldo",
-                "⚖️ Auditoria & Impacto",
-                "📈 Volume & Frequência",
-            ]
+        self.render_sections(
+            {
+                "🎯 Performance & Saldo": self._tab_performance,
+                "⚖️ Auditoria & Impacto": self._tab_auditoria,
+                "📈 Volume & Frequência": self._tab_volume,
+            },
+            key="analytics_tabs",
         )
 
-        with tab1:
-            st.subheader("Resultado por Categoria")
-            st.plotly_chart(viz.plot_saldo_por_categoria(), width="stretch")
+        with st.expander("📥 Exportar Dados Analíticos"):
+            # Serializa só no clique, e uma vez por (dados, filtros, formato)
+            render_export_panel(
+                self.df_f,
+                cache_key=(self.selection_key, "analytics"),
+                file_stem="analytics_caec_export",
+                key="analytics_export",
+                label="Download Base Filtrada",
+            )
 
-            c1, c2 = st.columns(2)
-            with c1:
-                st.plotly_chart(viz.plot_ranking(tipo="receita"), width="stretch")
-            with c2:
-                st.plotly_chart(viz.plot_ranking(tipo="despesa"), width="stretch")
+    def _tab_performance(self):
+        st.subheader("Resultado por Categoria")
+        st.plotly_chart(self.figure("plot_saldo_por_categoria"), width="stretch")
 
-        with tab2:
-            st.subheader("Análise de Pareto (Regra 80/20)")
-            st.plotly_chart(viz.plot_analise_pareto(), width="stretch")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.plotly_chart(
+                self.figure("plot_ranking", tipo="receita"), width="stretch"
+            )
+        with c2:
+            st.plotly_chart(
+                self.figure("plot_ranking", tipo="despesa"), width="stretch"
+            )
 
-            st.subheader("Distribuição de Lançamentos (Clusters)")
-            st.plotly_chart(viz.plot_dispersao(), width="stretch")
+    def _tab_auditoria(self):
+        st.subheader("Análise de Pareto (Regra 80/20)")
+        st.plotly_chart(self.figure("plot_analise_pareto"), width="stretch")
 
-        with tab3:
-            st.subheader("Volume Operacional")
-            st.plotly_chart(viz.plot_volume_dados(), width="stretch")
+        st.subheader("Distribuição de Lançamentos (Clusters)")
+        st.plotly_chart(self.figure("plot_dispersao"), width="stretch")
 
-            st.subheader("Ticket Médio por Setor")
-            st.plotly_chart(viz.plot_ticket_medio(), width="stretch")
+    def _tab_volume(self):
+        st.subheader("Volume Operacional")
+        st.plotly_chart(self.figure("plot_volume_dados"), width="stretch")
 
-        with st.expander("📥 Exportar Dados Analíticos"):
-            csv = self.df_f.to_csv(index=False).encode("utf-8-sig")
-            st.download_button(
-                label="Download Base Filtrada (CSV)",
-                data=csv,
-                file_name="analytics_caec_export.csv",
-                mime="text/csv",
-                width="stretch",
-            )
+        st.subheader("Ticket Médio por Setor")
+        st.plotly_chart(self.figure("plot_ticket_medio"), width="stretch")
@@ -1,8 +1,9 @@
 from core import (
     st,
     BasePage,
-    FinanceVisualizer,
+    render_export_panel,
 )
+from data.table import get_table, render_ledger_table
 
 
 class FinancePage(BasePage):
@@ -14,8 +15,8 @@ class FinancePage(BasePage):
     def render_sidebar(self):
         """Filtros Globais e Preparação dos Dados para o Extrato."""
         super().render_sidebar()
-        # Garante a ordenação dos dados para a tabela
-        self.df_table = self.df_f.sort_values("DATA", ascending=False)
+        # O loader já entrega ordenado por DATA: basta inverter (view, sem sort)
+        self.df_table = self.df_f.iloc[::-1]
 
     def render_header(self):
         """Subtítulo limpo - sem divider."""
@@ -24,45 +25,42 @@ class FinancePage(BasePage):
 
     def render_body(self):
         """Corpo da página otimizado com preenchimento total."""
-        viz = FinanceVisualizer(self.df_f)
-
-        tab_perf, tab_data = st.tabs(
-            ["📊 Performance Financeira", "📑 Extrato Detalhado"]
+        self.render_sections(
+            {
+                "📊 Performance Financeira": self._tab_performance,
+                "📑 Extrato Detalhado": self._tab_extrato,
+            },
+            key="finance_tabs",
         )
 
-        with tab_perf:
-            # 1. Evolução de Patrimônio
-            st.subheader("Evolução de Patrimônio")
-            st.plotly_chart(viz.plot_run_chart(), width="stretch")
-
-            # Espaçamento manual leve em vez de divider
-            st.write("")
+    def _tab_performance(self):
+        # 1. Evolução de Patrimônio
+        st.subheader("Evolução de Patrimônio")
+        st.plotly_chart(self.figure("plot_run_chart"), width="stretch")
 
-            # 2. Resultado Financeiro por Setor
-            st.subheader("Resultado por Categoria")
-            st.plotly_chart(viz.plot_saldo_por_categoria(), width="stretch")
+        # Espaçamento manual leve em vez de divider
+        st.write("")
 
-        with tab_data:
-            col_title, col_export = st.columns([4, 1])
+        # 2. Resultado Financeiro por Setor
+        st.subheader("Resultado por Categoria")
+        st.plotly_chart(self.figure("plot_saldo_por_categoria"), width="stretch")
 
-            with col_title:
-                st.subheader("Listagem de Lançamentos")
+    def _tab_extrato(self):
+        col_title, col_export = st.columns([4, 1])
 
-            with col_export:
-                # Conversão segura para CSV
-                csv = self.df_table.to_csv(index=False).encode("utf-8-sig")
-                st.download_button(
-                    label="📥 Exportar CSV",
-                    data=csv,
-                    file_name="extrato_caec_financeiro.csv",
-                    mime="text/csv",
-                    use_container_width=True,
-                )
+        with col_title:
+            st.subheader("Listagem de Lançamentos")
 
-            # Tabela com largura stretch 2026
-            st.dataframe(
-                self.df_table[["DATA", "CATEGORIA", "DESCRIÇÃO", "VALOR_NUM"]],
-                width="stretch",
-                height=600,
-                hide_index=True,
+        with col_export:
+            # Export sob demanda (CSV/Parquet/XLSX), cacheado por dados + filtros
+            render_export_panel(
+                self.df_table,
+                cache_key=(self.selection_key, "extrato"),
+                file_stem="extrato_caec_financeiro",
+                key="finance_export",
+                label="📥 Exportar",
             )
+
+        # Paginada no servidor: só a página atual vai para o navegador
+        table = get_table(self.df_f, cache_key=(self.selection_key, "extrato"))
+        render_ledger_table(table, key="finance_table")
@@ -0,0 +1,50 @@
+"""Extrato sintético comum aos testes, sem depender de benchmarks/."""
+
+import datetime
+import random
+
+import pytest
+
+from data.loader import EXPECTED_COLS, process_data_logic
+
+CATEGORIAS = ["Eventos", "Patrocínio", "Loja", "Manutenção", "Festa", "Transporte"]
+# Seis anos de lançamentos: cobre comparações contra o ano anterior
+INICIO = datetime.date(2020, 1, 1)
+DIAS = 6 * 365
+
+
+def gerar_planilha(n: int, seed: int = 0) -> list:
+    """Título + cabeçalho + n lançamentos em ordem de data, como a API devolve."""
+    r = random.Random(seed)
+    linhas = [["CAEC - Extrato"], list(EXPECTED_COLS)]
+    saldo = 0.0
+    for i in range(n):
+        tipo = "Despesa" if r.random() < 0.6 else "Receita"
+        valor = round(r.uniform(5, 5000), 2)
+        saldo += valor if tipo == "Receita" else -valor
+        data = INICIO + datetime.timedelta(days=i * DIAS // max(n, 1))
+        linhas.append(
+            [
+                data.strftime("%d/%m/%Y"),
+                tipo,
+                r.choice(CATEGORIAS),
+                f"Lançamento {i}",
+                valor,
+                "" if i % 5 else "nota fiscal",
+                round(saldo, 2),
+            ]
+        )
+    return linhas
+
+
+@pytest.fixture(scope="session")
+def planilha():
+    """O gerador, para testes que precisam de linhas cruas (ex.: cargas parciais)."""
+    return gerar_planilha
+
+
+@pytest.fixture(scope="session")
+def extrato():
+    """5 000 lançamentos processados. Compartilhado: não altere, copie."""
+    df, _ = process_data_logic(gerar_planilha(5_000))
+    return df
@@ -0,0 +1,103 @@
+"""BalanceIndex (saldos e período anterior) contra somas direto das linhas."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.cube import YOY
+from data.dataset import build_ledger
+
+
+@pytest.fixture(scope="module")
+def indexado(extrato):
+    # Um mês sem lançamentos no meio: o calendário do índice não pode pular
+    df = extrato[extrato["year_month"] != "2022-03"].reset_index(drop=True)
+    return df, build_ledger(df).balances
+
+
+def _linhas(df, meses, cats):
+    sel = df["year_month"].astype(str).isin(meses) & df["CATEGORIA"].isin(cats)
+    return df.loc[sel, "VALOR_NUM"]
+
+
+def _cats(df):
+    return sorted(map(str, df["CATEGORIA"].cat.categories))[:3]
+
+
+def test_calendar_has_no_gaps(indexado):
+    _, idx = indexado
+    assert "2022-03" in idx.months
+    assert idx.pos[idx.months.get_loc("2022-03")].sum() == 0
+
+
+def test_opening_closing(indexado):
+    df, idx = indexado
+    cats = _cats(df)
+    meses = ["2023-05", "2023-06", "2023-07"]
+    antes = df["DATA"] < "2023-05-01"
+    ate = df["DATA"] < "2023-08-01"
+    no_recorte = df["CATEGORIA"].isin(cats)
+    assert idx.opening(meses, cats) == pytest.approx(
+        df.loc[antes & no_recorte, "VALOR_NUM"].sum()
+    )
+    assert idx.closing(meses, cats) == pytest.approx(
+        df.loc[ate & no_recorte, "VALOR_NUM"].sum()
+    )
+    assert idx.before("2023-05", cats) == pytest.approx(idx.opening(meses, cats))
+
+
+@pytest.mark.parametrize(
+    "meses, anteriores",
+    [
+        (["2023-01"], ["2022-12"]),
+        (["2022-04", "2022-05"], ["2022-02", "2022-03"]),  # atravessa o buraco
+        (["2023-04", "2023-05", "2023-06"], ["2023-01", "2023-02", "2023-03"]),
+    ],
+)
+def test_previous_period(indexado, meses, anteriores):
+    df, idx = indexado
+    cats = _cats(df)
+    receitas, despesas, span = idx.previous(meses, cats)
+    v = _linhas(df, anteriores, cats)
+    assert span == len(meses)
+    assert receitas == pytest.approx(v[v > 0].sum())
+    assert despesas == pytest.approx(v[v < 0].sum())
+
+
+def test_previous_needs_history(indexado):
+    df, idx = indexado
+    assert idx.previous(list(idx.months), _cats(df)) is None
+    assert idx.previous([idx.months[0]], _cats(df)) is None
+
+
+def _mensal(df, idx, cats) -> pd.Series:
+    """Líquido por mês do calendário do índice, direto das linhas."""
+    v = df.loc[df["CATEGORIA"].isin(cats)]
+    s = v.groupby(v["year_month"].astype(str))["VALOR_NUM"].sum()
+    return s.reindex(idx.months, fill_value=0.0)
+
+
+def test_rolling_mean(indexado):
+    df, idx = indexado
+    cats = _cats(df)
+    esperado = _mensal(df, idx, cats).rolling(3).mean().to_numpy()
+    np.testing.assert_allclose(idx.rolling_mean(cats, 3), esperado)
+
+
+def test_change_yoy(indexado):
+    df, idx = indexado
+    cats = _cats(df)
+    mensal = _mensal(df, idx, cats)
+    base = mensal.shift(YOY).replace(0.0, np.nan)  # sem base: NaN, não inf
+    esperado = ((mensal - base) / base.abs() * 100).to_numpy()
+    np.testing.assert_allclose(idx.change(cats, YOY), esperado)
+
+
+def test_year_ago(indexado):
+    df, idx = indexado
+    cats = _cats(df)
+    receitas, despesas = idx.year_ago(["2023-03", "2023-04"], cats)
+    v = _linhas(df, ["2022-03", "2022-04"], cats)  # 2022-03 é o mês vazio
+    assert receitas == pytest.approx(v[v > 0].sum())
+    assert despesas == pytest.approx(v[v < 0].sum())
+    assert idx.year_ago([idx.months[11]], cats) is None
@@ -0,0 +1,70 @@
+"""Caches de processo: hit, despejo por itens e por bytes."""
+
+from functools import partial
+
+from core.export import ExportCache, _to_csv
+from data.table import LedgerTable, TableCache
+
+
+class Contador:
+    """Build que conta as chamadas: hit não pode montar de novo."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.fn()
+
+
+def test_table_cache_hit_reuses_the_table(extrato):
+    cache = TableCache()
+    build = Contador(partial(LedgerTable, extrato))
+    primeira = cache.get_or_build((1, "todos"), build)
+    assert cache.get_or_build((1, "todos"), build) is primeira
+    assert build.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_table_cache_evicts_least_recently_used(extrato):
+    cache = TableCache(maxsize=2)
+    for key in ("a", "b"):
+        cache.get_or_build(key, partial(LedgerTable, extrato))
+    cache.get_or_build("a", partial(LedgerTable, extrato))  # "a" volta a ser recente
+    cache.get_or_build("c", partial(LedgerTable, extrato))
+
+    assert len(cache) == 2
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_export_cache_hit_skips_serialization(extrato):
+    cache = ExportCache()
+    build = Contador(partial(_to_csv, extrato.head(50)))
+    dados = cache.get_or_build(((1, "todos"), "CSV"), build)
+    assert cache.get_or_build(((1, "todos"), "CSV"), build) is dados
+    assert build.calls == 1
+    assert cache.nbytes == len(dados)
+
+
+def test_export_cache_evicts_by_bytes():
+    cache = ExportCache(max_bytes=250)
+    for key in ("a", "b", "c"):
+        cache.get_or_build(key, lambda: b"x" * 100)
+
+    # 300 bytes não cabem em 250: sai o mais antigo
+    assert "a" not in cache
+    assert len(cache) == 2
+    assert cache.nbytes == 200
+
+
+def test_export_cache_skips_values_over_the_limit():
+    cache = ExportCache(max_bytes=250)
+    cache.get_or_build("a", lambda: b"x" * 100)
+    grande = cache.get_or_build("grande", lambda: b"x" * 300)
+
+    # Devolvido para o download, mas sem entrar nem despejar o que já estava
+    assert len(grande) == 300
+    assert "grande" not in cache
+    assert "a" in cache
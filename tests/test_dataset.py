@@ -0,0 +1,41 @@
+"""O ledger compartilhado entre sessões não aceita escrita em nada."""
+
+import pytest
+
+from data.dataset import build_ledger
+
+
+@pytest.fixture(scope="module")
+def ledger(extrato):
+    # build_ledger congela os arrays do df: uma cópia, não o extrato comum
+    return build_ledger(extrato.copy())
+
+
+def _set_cube(ledger):
+    ledger.cube.loc[0, "total"] = 1e9
+
+
+def _set_prefix(ledger):
+    ledger.balances.prefix[:] = 0
+
+
+def _set_pos(ledger):
+    ledger.balances.pos[0, 0] = 1.0
+
+
+def _set_postings(ledger):
+    ledger.search.segments[0].postings[0] = 0
+
+
+@pytest.mark.parametrize("write", [_set_cube, _set_prefix, _set_pos, _set_postings])
+def test_shared_structures_are_read_only(ledger, write):
+    with pytest.raises(ValueError, match="read-only"):
+        write(ledger)
+
+
+def test_session_copy_does_not_leak(ledger):
+    total = ledger.cube.loc[0, "total"]
+    df = ledger.df
+    df.loc[0, "VALOR_NUM"] = 1e9  # Copy-on-Write: só o invólucro da sessão muda
+    assert ledger.df.loc[0, "VALOR_NUM"] != 1e9
+    assert ledger.cube.loc[0, "total"] == total
@@ -0,0 +1,61 @@
+"""parse_money_series contra parse_money, célula a célula."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.loader import parse_money, parse_money_series
+
+TEXTOS = {
+    "R$ 1.234,56": 1234.56,
+    "1.234,56": 1234.56,
+    "R$ 1.234.567,89": 1234567.89,
+    "(R$ 1.234,56)": -1234.56,
+    "(250,00)": -250.0,
+    "-1.234,56": -1234.56,
+    "-R$ 10,00": -10.0,
+    "  R$ 0,50 ": 0.5,
+    "12": 12.0,
+    "": 0.0,
+    "a confirmar": 0.0,
+    "R$": 0.0,
+    "--": 0.0,
+    "1e3": 1000.0,  # float() aceita, o vetorizado também
+}
+
+
+@pytest.mark.parametrize("texto, esperado", TEXTOS.items())
+def test_text_cells(texto, esperado):
+    assert parse_money(texto) == pytest.approx(esperado)
+    assert parse_money_series(pd.Series([texto], dtype=object))[0] == pytest.approx(
+        esperado
+    )
+
+
+def test_blank_and_missing_cells():
+    col = pd.Series(["", None, np.nan, "R$ 5,00"], dtype=object)
+    esperado = pd.Series([0.0, 0.0, 0.0, 5.0])
+    pd.testing.assert_series_equal(parse_money_series(col), esperado)
+    pd.testing.assert_series_equal(col.apply(parse_money), esperado)
+
+
+def test_same_as_row_by_row_on_a_mixed_column():
+    col = pd.Series(list(TEXTOS) * 3 + ["nan", "1_000", "R$ 1.000,00 x"], dtype=object)
+    pd.testing.assert_series_equal(parse_money_series(col), col.apply(parse_money))
+
+
+def test_numeric_cells_pass_through():
+    # Lidas sem formatação, células de valor chegam como número: 12.5 fica
+    # 12.5. parse_money trataria "12.5" como texto com milhar e daria 125
+    # (diferença intencional, vinda da busca com UNFORMATTED_VALUE).
+    col = pd.Series([12.5, 1000, "R$ 1,50", ""], dtype=object)
+    esperado = pd.Series([12.5, 1000.0, 1.5, 0.0])
+    pd.testing.assert_series_equal(parse_money_series(col), esperado)
+    assert parse_money(12.5) == 125.0
+
+
+def test_all_numeric_column():
+    col = pd.Series([1.25, -3.0, np.nan])
+    pd.testing.assert_series_equal(
+        parse_money_series(col), pd.Series([1.25, -3.0, 0.0])
+    )
@@ -0,0 +1,26 @@
+"""FinanceVisualizer agrupa as linhas por categoria no máximo uma vez."""
+
+from core.plots import FinanceVisualizer
+from data.cube import build_cube, summarize_categories
+
+
+def _plot_all_by_category(viz: FinanceVisualizer):
+    viz.plot_analise_pareto()
+    viz.plot_volume_dados()
+    viz.plot_ticket_medio()
+    viz.plot_saldo_por_categoria()
+    viz.plot_ranking("despesa")
+    viz.plot_ranking("receita")
+
+
+def test_single_scan_without_summary(extrato):
+    viz = FinanceVisualizer(extrato, summary=None)
+    _plot_all_by_category(viz)
+    assert viz.scans == 1
+
+
+def test_no_scan_with_cube_summary(extrato):
+    summary = summarize_categories(build_cube(extrato))
+    viz = FinanceVisualizer(extrato, summary=summary)
+    _plot_all_by_category(viz)
+    assert viz.scans == 0
@@ -0,0 +1,89 @@
+"""RefreshScheduler: backoff enquanto a origem falha e refresh único por vez."""
+
+import threading
+import time
+
+import pytest
+
+from data.dataset import build_ledger
+from data.scheduler import RefreshScheduler
+
+
+@pytest.fixture(scope="module")
+def ledger(extrato):
+    return build_ledger(extrato.head(200).copy())
+
+
+class Origem:
+    """refresh_fn falso: falha enquanto `falhar`, conta as buscas."""
+
+    def __init__(self, ledger, falhar=False, espera=0.0):
+        self.ledger = ledger
+        self.falhar = falhar
+        self.espera = espera
+        self.calls = 0
+
+    def __call__(self, anterior):
+        self.calls += 1
+        time.sleep(self.espera)
+        if self.falhar:
+            raise ConnectionError("API fora do ar")
+        return self.ledger
+
+
+def test_failure_opens_backoff_and_success_closes_it(ledger):
+    origem = Origem(ledger, falhar=True)
+    sched = RefreshScheduler(origem, retry_base=30, max_backoff=100)
+
+    antes = time.time()
+    assert sched.refresh_now() is False
+    assert sched.in_backoff()
+    assert sched.retry_at == pytest.approx(antes + 30, abs=1)
+    assert sched.last_error == "API fora do ar"
+    assert sched.version == 0  # nada publicado
+
+    # Backoff dobra a cada falha seguida, até o teto
+    sched.refresh_now()
+    assert sched.retry_at == pytest.approx(time.time() + 60, abs=1)
+    sched.refresh_now()
+    assert sched.retry_at == pytest.approx(time.time() + 100, abs=1)
+    assert (sched.failures, sched.total_failures) == (3, 3)
+
+    origem.falhar = False
+    assert sched.refresh_now() is True
+    assert not sched.in_backoff()
+    assert sched.retry_at is None and sched.last_error is None
+    assert (sched.failures, sched.total_failures) == (0, 3)
+    assert sched.version == 1
+
+
+def test_failed_refresh_keeps_the_published_ledger(ledger):
+    origem = Origem(ledger)
+    sched = RefreshScheduler(origem)
+    sched.refresh_now()
+    publicado = sched.current()
+
+    origem.falhar = True
+    assert sched.refresh_now() is False
+    assert sched.current() is publicado
+
+
+@pytest.mark.parametrize("falhar", [False, True])
+def test_concurrent_refresh_reuses_the_running_one(ledger, falhar):
+    origem = Origem(ledger, falhar=falhar, espera=0.2)
+    sched = RefreshScheduler(origem)
+    resultados = []
+
+    threads = [
+        threading.Thread(target=lambda: resultados.append(sched.refresh_now()))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Uma busca só; quem esperou fica com o resultado dela
+    assert origem.calls == 1
+    assert resultados == [not falhar] * 4
+    assert sched.failures == int(falhar)
@@ -0,0 +1,53 @@
+"""TokenIndex.extend em lotes dá o mesmo índice que build no extrato inteiro."""
+
+import numpy as np
+import pytest
+
+from data.search import MAX_SEGMENTS, TokenIndex
+
+BUSCAS = ["lanc", "lançamento 12", "nota fiscal", "NOTA", "4999", "xyz", ""]
+
+
+def _em_lotes(df, lotes: int) -> TokenIndex:
+    idx = TokenIndex.build(df.iloc[:0])
+    for fim in np.linspace(0, len(df), lotes + 1, dtype=int)[1:]:
+        idx = idx.extend(df.iloc[:fim])
+    return idx
+
+
+def _mesmas_buscas(a: TokenIndex, b: TokenIndex):
+    for busca in BUSCAS:
+        ha, hb = a.query(busca), b.query(busca)
+        if hb is None:
+            assert ha is None
+        else:
+            np.testing.assert_array_equal(ha, hb)
+
+
+@pytest.mark.parametrize("lotes", [1, 3, MAX_SEGMENTS])
+def test_extend_matches_build(extrato, lotes):
+    idx = _em_lotes(extrato, lotes)
+    assert len(idx.segments) == lotes
+    assert idx.n_rows == len(extrato)
+    _mesmas_buscas(idx, TokenIndex.build(extrato))
+
+
+def test_merged_segments_equal_a_full_build(extrato):
+    # Um lote além do limite funde tudo num segmento só
+    idx = _em_lotes(extrato, MAX_SEGMENTS + 1)
+    assert len(idx.segments) == 1
+
+    (fundido,) = idx.segments
+    (completo,) = TokenIndex.build(extrato).segments
+    np.testing.assert_array_equal(fundido.vocab, completo.vocab)
+    np.testing.assert_array_equal(fundido.offsets, completo.offsets)
+    np.testing.assert_array_equal(fundido.postings, completo.postings)
+    _mesmas_buscas(idx, TokenIndex.build(extrato))
+
+
+def test_extend_leaves_the_previous_index_alone(extrato):
+    antes = TokenIndex.build(extrato.iloc[:100])
+    depois = antes.extend(extrato)
+    assert antes.n_rows == 100
+    assert len(antes.query("lanc")) == 100
+    assert depois.query("lanc").sum() == len(extrato)
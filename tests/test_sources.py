@@ -0,0 +1,52 @@
+"""SheetsSource: uma falha descarta handles e o cliente em cache."""
+
+import pytest
+
+from data.sources import SheetsSource
+
+
+class _Workbook:
+    """Workbook mínimo: falha enquanto `falhas` > 0, depois lê a aba."""
+
+    last_appended = None
+
+    def __init__(self, falhas: int):
+        self.falhas = falhas
+
+    def refresh(self, refs, open_ws):
+        ws = open_ws(refs[-1])
+        if self.falhas:
+            self.falhas -= 1
+            raise RuntimeError("token expirado")
+        return ws, False
+
+
+class _Client:
+    def open(self, name):
+        return self
+
+    def get_worksheet(self, ref):
+        return f"aba {ref} via cliente {id(self)}"
+
+
+def test_failure_resets_cached_client():
+    clientes, resets = [], []
+
+    def factory():
+        clientes.append(_Client())
+        return clientes[-1]
+
+    source = SheetsSource(
+        factory,
+        _Workbook(falhas=1),
+        [0],
+        spreadsheet_name="x",
+        reset_client=lambda: resets.append(1),
+    )
+    with pytest.raises(RuntimeError):
+        source.load()
+    assert resets == [1]
+
+    ws, _ = source.load()
+    assert len(clientes) == 2  # handles descartados: cliente resolvido de novo
+    assert ws == f"aba 0 via cliente {id(clientes[-1])}"
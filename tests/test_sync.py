@@ -0,0 +1,76 @@
+"""IncrementalSync: o caminho incremental chega no mesmo df da carga completa."""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_sheet import FakeWorksheet, gerar_celulas
+from data.loader import EXPECTED_COLS, FETCH_OPTS, process_data_logic
+from data.sync import IncrementalSync, fetch_values
+
+
+def _sync() -> IncrementalSync:
+    return IncrementalSync(
+        process_data_logic, n_cols=len(EXPECTED_COLS), fetch_opts=FETCH_OPTS
+    )
+
+
+def _completo(ws) -> pd.DataFrame:
+    df, _ = process_data_logic(fetch_values(ws, len(EXPECTED_COLS), FETCH_OPTS))
+    return df
+
+
+@pytest.fixture
+def ws():
+    # 1.200 lançamentos: as primeiras 1.000 linhas ficam na planilha, o resto
+    # chega depois em appends (já em ordem de data)
+    linhas = gerar_celulas(1_200)
+    ws = FakeWorksheet(linhas[:1_002])
+    ws.resto = linhas[1_002:]
+    return ws
+
+
+def test_append_matches_full_reload(ws):
+    sync = _sync()
+    sync.refresh(ws)
+    assert sync.last_appended is None  # primeira carga é completa
+
+    for lote in (ws.resto[:150], ws.resto[150:]):
+        ws.append_rows(lote)
+        df, _ = sync.refresh(ws)
+        assert sync.last_appended == len(lote)
+        pd.testing.assert_frame_equal(df, _completo(ws))
+    assert sync.watermark == len(ws.linhas)
+
+
+def test_nothing_new_is_a_noop(ws):
+    sync = _sync()
+    antes, _ = sync.refresh(ws)
+    depois, _ = sync.refresh(ws)
+    assert sync.last_appended == 0
+    assert depois is antes
+
+
+def test_backdated_entry_rebuilds_balance(ws):
+    sync = _sync()
+    sync.refresh(ws)
+    linha = list(ws.resto[0])
+    linha[0] = datetime.date(2020, 6, 1)  # anterior ao último lançamento
+    ws.append_rows([linha])
+
+    df, _ = sync.refresh(ws)
+    assert sync.last_appended is None
+    # Reordenado por data e com o saldo refeito, como na carga completa
+    pd.testing.assert_frame_equal(df, _completo(ws))
+
+
+def test_edit_in_the_tail_forces_full_reload(ws):
+    sync = _sync()
+    sync.refresh(ws)
+    ws.linhas[-1][4] = 1.0  # edita o valor do último lançamento
+    ws.append_rows(ws.resto[:10])
+
+    df, _ = sync.refresh(ws)
+    assert sync.last_appended is None
+    pd.testing.assert_frame_equal(df, _completo(ws))
@@ -0,0 +1,56 @@
+"""Workbook: abas buscadas em paralelo, com um cliente falso que dorme por fetch."""
+
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_sheet import FakeSpreadsheet
+from data.loader import EXPECTED_COLS, FETCH_OPTS, process_data_logic
+from data.workbook import Workbook
+
+ANOS = [2021, 2022, 2023, 2024]
+LATENCIA = 0.3
+LINHAS_POR_ABA = 500
+
+
+def _workbook(workers: int) -> Workbook:
+    return Workbook(
+        process_data_logic,
+        n_cols=len(EXPECTED_COLS),
+        fetch_opts=FETCH_OPTS,
+        incremental=False,
+        max_workers=workers,
+    )
+
+
+def _carga(workers: int):
+    sh = FakeSpreadsheet.por_ano(ANOS, LINHAS_POR_ABA, LATENCIA)
+    wb = _workbook(workers)
+    t0 = time.perf_counter()
+    df, _ = wb.refresh([str(a) for a in ANOS], sh.worksheet)
+    return df, time.perf_counter() - t0, wb, sh
+
+
+def test_fetches_overlap():
+    _, wall, _, sh = _carga(workers=len(ANOS))
+    assert sh.calls == len(ANOS)
+    # Em série seriam len(ANOS) latências; em paralelo, perto de uma
+    assert wall < len(ANOS) * LATENCIA * 0.6
+
+
+def test_parallel_equals_serial():
+    paralelo, _, _, _ = _carga(workers=len(ANOS))
+    serie, _, _, _ = _carga(workers=1)
+    pd.testing.assert_frame_equal(paralelo, serie)
+    assert paralelo["DATA"].is_monotonic_increasing
+    saldo = paralelo["Saldo Acumulado"].iloc[-1]
+    assert saldo == pytest.approx(paralelo["VALOR_NUM"].sum())
+
+
+def test_second_refresh_fetches_only_current_year():
+    _, _, wb, sh = _carga(workers=len(ANOS))
+    antes = sh.calls
+    wb.refresh([str(a) for a in ANOS], sh.worksheet)
+    assert sh.calls - antes == 1
+    assert sh.worksheet(str(ANOS[-1])).calls == 2